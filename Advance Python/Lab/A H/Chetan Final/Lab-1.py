@@ -1,33 +1,31 @@
-import re
-from datetime import datetime
+import argparse
 import os
 
-def process(row: str, products: dict[str, int], ratings: dict[str, int]) -> None:
-    pattern = re.compile("\"[^\"]*\"")
-    row = re.sub(pattern, "", row).strip().split()
-    if len(row) > 4:
-        raise ValueError("Extra Values")
-    if len(row[0]) == 6 or row[0].isalnum():
-        if len(row[1]) == 10 or row[1].isalnum():
-            if datetime.strptime(row[2], "%Y-%m-%d"):
-                if 1 <= int(row[3]) <= 5:
-                    products[row[1]] = products.get(row[1], 0) + 1
-                    ratings[row[1]] = ratings.get(row[1], 0) + int(row[3])
-                    return
-    raise ValueError("Some Error")
+from reviews.checkpoint import update
+from reviews.counters import ProductCounters
+from reviews.ingest import DEFAULT_SHARD_SIZE, ENGINES, ingest
+from reviews.reader import iter_rows
+from reviews.stats import TIE_BREAKS, RatingStats, top_products
+from reviews.rows import process
+from reviews.validate import Reason
 
 def read(file: str, products: dict[str, int], ratings: dict[str, int]) -> tuple[int, int]:
     valid, invalid = 0, 0
+    # Rows are streamed, so count into local dicts and merge only once the whole file was readable.
+    file_products, file_ratings = {}, {}
     try:
-        with open(file.replace("\\", "/"), "r") as f:
-            for row in f.readlines():
-                try:
-                    process(row, products, ratings)
-                    valid += 1
-                except:
-                    invalid += 1
+        for row in iter_rows(file.replace("\\", "/")):
+            try:
+                process(row, file_products, file_ratings)
+                valid += 1
+            except:
+                invalid += 1
     except Exception as e:
         print(f"Cannot open file {file}\nError: {e}")
+        return 0, 0
+    for product, count in file_products.items():
+        products[product] = products.get(product, 0) + count
+        ratings[product] = ratings.get(product, 0) + file_ratings[product]
     return valid, invalid
 
 def start(dir: str, products: dict[str, int], ratings: dict[str, int]) -> tuple[int, int]:
@@ -42,19 +40,80 @@ def start(dir: str, products: dict[str, int], ratings: dict[str, int]) -> tuple[
             valid, invalid = valid + v, invalid + i
     return valid, invalid
 
-def main():
-    dir = r"files"
-    products, ratings = {}, {}
-    valid, invalid = start(dir, products, ratings)
-    average = {p: ratings[p] / products[p] for p in products}
-    top_keys = sorted(average, reverse=True, key=lambda x: average[x])[:3]
-    with open("summary.txt", "w+") as f:
+def write_summary(path: str, valid: int, invalid: int, top: list[tuple[str, float]], k: int = 3) -> None:
+    with open(path, "w+") as f:
         f.write(f"1) The total number of reviews processed -> {valid + invalid}\n")
         f.write(f"2) The total number of valid reviews -> {valid}\n")
         f.write(f"3) The total number of invalid reviews -> {invalid}\n")
-        f.write("4) Top 3 products with the highest average ratings\n")
-        for i, key in enumerate(top_keys):
-            f.write(f"\t{i+1}) {key} -> {average[key]}\n")
+        f.write(f"4) Top {k} products with the highest average ratings\n")
+        for i, (key, average) in enumerate(top):
+            f.write(f"\t{i+1}) {key} -> {average}\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise the review files.")
+    parser.add_argument("dir", nargs="?", default="files")
+    parser.add_argument("-j", "--workers", type=int, default=0,
+                        help="parse files in this many processes (0 = serial, -1 = one per CPU)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE,
+                        help="split files larger than this many bytes across workers")
+    parser.add_argument("--mmap", action="store_true",
+                        help="find shard boundaries and read rows through mmap")
+    parser.add_argument("--engine", choices=ENGINES, default="lab",
+                        help="row parser: lab = process(), regex = single-pass validator with reason codes")
+    parser.add_argument("--compact", action="store_true",
+                        help="aggregate into interned product codes and array counters instead of two dicts")
+    parser.add_argument("--incremental", metavar="STATE",
+                        help="keep totals in this checkpoint file and parse only new files and appended rows")
+    parser.add_argument("--cache", metavar="DIR",
+                        help="keep validated rows of each file as columns in DIR and aggregate from them (regex validator)")
+    parser.add_argument("-k", "--top", type=int, default=3, help="how many products to rank")
+    parser.add_argument("--min-reviews", type=int, default=1, help="rank only products with at least this many valid reviews")
+    parser.add_argument("--tie-break", choices=TIE_BREAKS, default="first",
+                        help="order of equal averages: first counted, most reviews, or product ID")
+    parser.add_argument("--stats", action="store_true",
+                        help="print mean and standard deviation of the ranked products")
+    parser.add_argument("--reasons", action="store_true", help="print invalid rows per reason (regex engine)")
+    args = parser.parse_args()
+    dir = args.dir
+    products, ratings = {}, {}
+    reasons = [0] * len(Reason)
+    workers = None if args.workers < 0 else args.workers
+    stats = RatingStats() if args.stats else None
+    if args.incremental:
+        state, delta = update(dir, args.incremental, args.engine, workers, args.mmap, args.stats)
+        products, ratings, reasons = state.totals.products, state.totals.ratings, state.totals.reasons
+        stats = state.totals.stats if args.stats else None
+        valid, invalid = state.totals.valid, state.totals.invalid
+        print(f"{'Rebuilt' if delta.rebuilt else 'Updated'} {args.incremental}: {delta.files} files, {delta.bytes} new bytes")
+    elif args.cache:
+        try:
+            from reviews.cache import ReviewCache, aggregate
+        except ImportError as e:
+            parser.error(f"--cache needs NumPy ({e})")
+        cache = ReviewCache(args.cache)
+        (valid, invalid), report = aggregate(dir, products, ratings, cache, workers, reasons, stats)
+        print(f"Cache {args.cache} ({cache.format}): {report.built} files parsed, {report.reused} reused")
+    elif args.compact:
+        counters = ProductCounters()
+        valid, invalid = ingest(dir, products, ratings, workers, args.shard_size, args.engine, reasons, args.mmap, counters,
+                                stats)
+    elif args.workers or args.engine != "lab" or args.stats or args.mmap:
+        valid, invalid = ingest(dir, products, ratings, workers, args.shard_size, args.engine, reasons, args.mmap,
+                                stats=stats)
+    else:
+        valid, invalid = start(dir, products, ratings)
+    if args.reasons:
+        for reason in Reason:
+            print(f"{reason.name:<10} {reasons[reason]}")
+    if args.compact and not (args.incremental or args.cache):
+        top = counters.top(args.top, args.min_reviews, args.tie_break)
+    else:
+        top = top_products(products, ratings, args.top, args.min_reviews, args.tie_break)
+    if stats is not None:
+        for key, _ in top:
+            if key in stats.moments:
+                print(f"{key}: {stats.count(key)} reviews, mean {stats.mean(key):.3f}, stdev {stats.stdev(key):.3f}")
+    write_summary("summary.txt", valid, invalid, top, args.top)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1 @@
+"""Engines behind the Lab-1 review processor (Lab-1.py is the entry point)."""
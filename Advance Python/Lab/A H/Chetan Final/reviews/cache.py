@@ -0,0 +1,293 @@
+"""Columnar cache of validated reviews.
+
+:meth:`ReviewCache.convert` parses a review file once with
+:func:`reviews.validate.validate` and stores the valid rows column by
+column, together with the per-reason row counts, under a name derived from
+the file's fingerprint (path, size, mtime).  A later run finds the entry by
+fingerprint and never tokenizes the text again; a changed file gets a new
+entry and its old one is removed.
+
+With pyarrow installed entries are Feather (Arrow IPC) files, otherwise
+uncompressed ``.npz`` archives.  :meth:`ReviewCache.load` reads only the
+requested columns and memory-maps them in both cases (``np.load`` does not
+map ``.npz`` members, so the stored arrays are mapped at their offset inside
+the archive).  In Feather the IDs are fixed-size binary columns and the
+comments a large-string column, so their Arrow buffers are handed out as
+NumPy views without building a Python object per row.
+
+Columns: ``line`` (row number in the file), ``reviewer`` and ``product``
+(UTF-8 bytes), ``date`` (``datetime64[D]``), ``rating`` (uint8) and the
+comments as ``comment_data`` (UTF-8 bytes), ``comment_offsets`` and
+``has_comment``; :func:`comments` turns those back into strings.
+"""
+
+import hashlib
+import os
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from .ingest import _InProcess, list_files
+from .reader import iter_rows
+from .stats import RatingStats
+from .validate import Reason, validate
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = feather = None
+
+VERSION = 2
+COLUMNS = ("line", "reviewer", "product", "date", "rating", "comment_data", "comment_offsets", "has_comment")
+
+
+def fingerprint(file: str) -> str:
+    stat = os.stat(file)
+    return f"{os.path.abspath(file)}\0{stat.st_size}\0{stat.st_mtime_ns}\0{VERSION}"
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8", "surrogateescape")).hexdigest()[:16]
+
+
+def parse_columns(file: str) -> tuple[dict[str, np.ndarray], list[int]]:
+    """Validate every row of ``file``; returns the valid rows as columns and the counts per :class:`Reason`."""
+    reasons = [0] * len(Reason)
+    lines, reviewers, products, dates, ratings = [], [], [], [], []
+    comment_data, offsets, has_comment = bytearray(), [0], []
+    for line, row in enumerate(iter_rows(file)):
+        reason, review = validate(row)
+        reasons[reason] += 1
+        if review is None:
+            continue
+        lines.append(line)
+        reviewers.append(review.reviewer.encode("utf-8"))
+        products.append(review.product.encode("utf-8"))
+        dates.append(review.date)
+        ratings.append(review.rating)
+        has_comment.append(review.comment is not None)
+        comment_data += (review.comment or "").encode("utf-8")
+        offsets.append(len(comment_data))
+    columns = {
+        "line": np.array(lines, dtype=np.uint32),
+        "reviewer": np.array(reviewers, dtype="S") if reviewers else np.empty(0, dtype="S1"),
+        "product": np.array(products, dtype="S") if products else np.empty(0, dtype="S1"),
+        "date": np.array(dates, dtype="datetime64[D]"),
+        "rating": np.array(ratings, dtype=np.uint8),
+        "comment_data": np.frombuffer(bytes(comment_data), dtype=np.uint8),
+        "comment_offsets": np.array(offsets, dtype=np.int64),
+        "has_comment": np.array(has_comment, dtype=bool),
+    }
+    return columns, reasons
+
+
+def comments(columns: dict[str, np.ndarray]) -> list[str | None]:
+    data, offsets = columns["comment_data"], columns["comment_offsets"]
+    raw = data.tobytes()
+    return [raw[offsets[i]:offsets[i + 1]].decode("utf-8") if flag else None
+            for i, flag in enumerate(columns["has_comment"].tolist())]
+
+
+def _write_npz(path: str, columns: dict[str, np.ndarray], reasons: list[int]) -> None:
+    with open(path, "wb") as f:
+        np.savez(f, reasons=np.array(reasons, dtype=np.int64), **columns)
+
+
+def _map_npz(path: str, names: Iterable[str]) -> dict[str, np.ndarray]:
+    """Memory-map members of an uncompressed ``.npz``; compressed members are read normally."""
+    result = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for name in names:
+            info = archive.getinfo(f"{name}.npy")
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    result[name] = np.lib.format.read_array(member)
+                continue
+            # Local file header: 30 fixed bytes, then the file name and extra field.
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = np.frombuffer(f.read(4), dtype="<u2")
+            f.seek(info.header_offset + 30 + int(name_len) + int(extra_len))
+            version = np.lib.format.read_magic(f)
+            read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+            shape, fortran, dtype = read_header(f)
+            if dtype.hasobject:
+                raise ValueError(f"{path}: column {name} holds Python objects")
+            if 0 in shape:
+                result[name] = np.empty(shape, dtype=dtype)
+            else:
+                result[name] = np.memmap(f, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                                         order="F" if fortran else "C")
+    return result
+
+
+def _write_feather(path: str, columns: dict[str, np.ndarray], reasons: list[int]) -> None:
+    n = len(columns["line"])
+
+    def fixed(ids: np.ndarray) -> "pa.Array":
+        return pa.FixedSizeBinaryArray.from_buffers(pa.binary(ids.dtype.itemsize), n, [None, pa.py_buffer(ids)])
+
+    has_comment = columns["has_comment"]
+    validity = pa.py_buffer(np.packbits(has_comment, bitorder="little")) if not has_comment.all() else None
+    comment = pa.LargeStringArray.from_buffers(n, pa.py_buffer(columns["comment_offsets"]),
+                                               pa.py_buffer(columns["comment_data"]), validity)
+    table = pa.table({
+        **{name: pa.array(columns[name]) for name in ("line", "date", "rating", "has_comment")},
+        "reviewer": fixed(columns["reviewer"]),
+        "product": fixed(columns["product"]),
+        "comment": comment,
+    }).replace_schema_metadata({"reasons": ",".join(map(str, reasons))})
+    # One record batch, so every column is a single contiguous buffer that load() can map without copying.
+    feather.write_feather(table, path, compression="uncompressed", chunksize=max(n, 1))
+
+
+def _read_feather(path: str, names: Iterable[str]) -> tuple[dict[str, np.ndarray], list[int]]:
+    """Read ``names`` from a memory-mapped Feather entry as NumPy views of the Arrow buffers where possible."""
+    names = list(names)
+    wanted = [name for name in ("line", "reviewer", "product", "date", "rating", "has_comment") if name in names]
+    if any(name.startswith("comment_") for name in names):
+        wanted += ["comment", "has_comment"]
+    table = feather.read_table(path, columns=list(dict.fromkeys(wanted)), memory_map=True)
+    result = {}
+    for name in table.column_names:
+        column = table.column(name)
+        chunk = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+        if name in ("reviewer", "product"):
+            width = chunk.type.byte_width
+            data = chunk.buffers()[1]
+            result[name] = (np.frombuffer(data, dtype=f"S{width}", count=len(chunk), offset=chunk.offset * width)
+                            if len(chunk) else np.empty(0, dtype=f"S{width}"))
+        elif name == "comment":
+            _, offsets, data = chunk.buffers()
+            result["comment_offsets"] = np.frombuffer(offsets, dtype=np.int64, count=len(chunk) + 1,
+                                                      offset=chunk.offset * 8)
+            result["comment_data"] = np.frombuffer(data, dtype=np.uint8) if data is not None else np.empty(0, np.uint8)
+        else:
+            result[name] = chunk.to_numpy(zero_copy_only=False)
+    reasons = [int(count) for count in table.schema.metadata[b"reasons"].decode().split(",")]
+    return {name: result[name] for name in names}, reasons
+
+
+def _convert(root: str, format: str, file: str) -> tuple[str | None, bool, str | None]:
+    """Build the cache entry for ``file`` if it is missing; returns (entry, built, error)."""
+    cache = ReviewCache(root, format)
+    try:
+        entry = cache.entry_for(file)
+        if entry.exists():
+            return str(entry), False, None
+        columns, reasons = parse_columns(file)
+    except Exception as e:
+        return None, False, str(e)
+    temp = entry.with_name(entry.name + ".tmp")
+    (_write_feather if format == "feather" else _write_npz)(str(temp), columns, reasons)
+    os.replace(temp, entry)
+    # Drop entries made for older versions of the same file.
+    for stale in entry.parent.glob(entry.name.split("-")[0] + "-*"):
+        if stale != entry:
+            stale.unlink(missing_ok=True)
+    return str(entry), True, None
+
+
+@dataclass
+class CacheReport:
+    built: int = 0
+    reused: int = 0
+    entries: dict[str, str] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+class ReviewCache:
+    def __init__(self, root: str = ".review_cache", format: str = "auto") -> None:
+        if format == "auto":
+            format = "feather" if feather is not None else "npz"
+        if format not in ("feather", "npz"):
+            raise ValueError("format must be 'auto', 'feather' or 'npz'")
+        if format == "feather" and feather is None:
+            raise ImportError("the feather format needs pyarrow")
+        self.root = Path(root)
+        self.format = format
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def entry_for(self, file: str) -> Path:
+        suffix = ".feather" if self.format == "feather" else ".npz"
+        return self.root / f"{_digest(os.path.abspath(file))}-{_digest(fingerprint(file))}{suffix}"
+
+    def convert(self, files: Iterable[str], workers: int | None = 0) -> CacheReport:
+        """Make sure every file has an up-to-date entry, parsing only the ones that do not.
+
+        The report maps each file to the entry made or found for it, which
+        stays valid if the file changes afterwards, and each unreadable file
+        to its error.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        report = CacheReport()
+        with (_InProcess() if workers == 0 else ProcessPoolExecutor(workers)) as pool:
+            futures = [(file, pool.submit(_convert, str(self.root), self.format, file)) for file in files]
+            for file, future in futures:
+                entry, built, error = future.result()
+                if error is not None:
+                    print(f"Cannot open file {file}\nError: {error}")
+                    report.errors[file] = error
+                    continue
+                report.entries[file] = entry
+                if built:
+                    report.built += 1
+                else:
+                    report.reused += 1
+        return report
+
+    def load(self, file: str, columns: Iterable[str] = ("product", "rating")) -> tuple[dict[str, np.ndarray], list[int]]:
+        """Memory-mapped ``columns`` of the (existing) entry for ``file`` and its reason counts."""
+        return self.read(self.entry_for(file), columns)
+
+    def read(self, entry: str | Path, columns: Iterable[str] = ("product", "rating")) -> tuple[dict[str, np.ndarray], list[int]]:
+        """Like :meth:`load`, for an entry path from :attr:`CacheReport.entries`."""
+        columns = list(columns)
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"unknown columns {sorted(unknown)}; available: {', '.join(COLUMNS)}")
+        if self.format == "feather":
+            return _read_feather(str(entry), columns)
+        mapped = _map_npz(str(entry), columns + ["reasons"])
+        reasons = mapped.pop("reasons").tolist()
+        return mapped, reasons
+
+
+def aggregate(dir: str, products: dict[str, int], ratings: dict[str, int], cache: ReviewCache,
+              workers: int | None = 0, reasons: list[int] | None = None,
+              stats: RatingStats | None = None) -> tuple[tuple[int, int], CacheReport]:
+    """Same totals as ``ingest(dir, ..., engine="regex")``, read from the cache (built first where needed).
+
+    Files are counted as they were when :meth:`ReviewCache.convert` saw them.
+    Rating moments per product and file are merged into ``stats`` if given.
+    """
+    report = cache.convert(list_files(dir), workers)
+    total = [0] * len(Reason) if reasons is None else reasons
+    for file, entry in list(report.entries.items()):
+        try:
+            columns, counts = cache.read(entry, ("product", "rating"))
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            print(f"Cannot read cache entry {entry} of {file}\nError: {e}")
+            report.errors[file] = str(e)
+            del report.entries[file]
+            continue
+        for reason, count in enumerate(counts):
+            total[reason] += count
+        ids, first, inverse = np.unique(columns["product"], return_index=True, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(ids))
+        sums = np.bincount(inverse, weights=columns["rating"], minlength=len(ids))
+        if stats is not None:
+            means = sums / np.maximum(counts, 1)
+            m2 = np.bincount(inverse, weights=(columns["rating"] - means[inverse]) ** 2, minlength=len(ids))
+        for i in np.argsort(first, kind="stable").tolist():
+            product = ids[i].decode("utf-8")
+            products[product] = products.get(product, 0) + int(counts[i])
+            ratings[product] = ratings.get(product, 0) + int(sums[i])
+            if stats is not None:
+                stats.add_moments(product, int(counts[i]), float(means[i]), float(m2[i]))
+    valid = total[Reason.OK]
+    return (valid, sum(total) - valid), report
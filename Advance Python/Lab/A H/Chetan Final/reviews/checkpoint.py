@@ -0,0 +1,215 @@
+"""Incremental aggregation of the review files with a persisted checkpoint.
+
+The checkpoint (a JSON file) holds the per-product count/sum totals and, for
+every file, its size, mtime, the byte offset up to which complete rows were
+counted and a CRC of the first and last bytes before that offset.  :func:`update`
+parses only files that are new or whose size/mtime changed, starting at the
+saved offset, so a rerun costs time proportional to what was added.
+
+An unterminated last row is counted like the full scan counts it, but kept
+as the file's ``tail`` and taken back out before the file is read again, in
+case the row was still being written.  Files are expected to only grow: one
+that was deleted, shrank, became unreadable or whose checked bytes changed
+cannot be updated in place, and the checkpoint is then rebuilt from scratch
+(edits elsewhere before the offset go unnoticed).  Products tied on average
+rating keep the order in which they were first counted, which after an
+incremental run may differ from a full scan.
+
+With ``stats=True`` the checkpoint also keeps per-product rating moments
+(:class:`~reviews.stats.RatingStats`), updated from the same parsed rows;
+a checkpoint made without them is rebuilt once, one made with them keeps
+them up to date from then on.
+"""
+
+import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+from .ingest import ENGINES, Partial, _InProcess, list_files, merge, parse_range
+from .stats import RatingStats
+
+VERSION = 1
+CHECK_BYTES = 64
+
+
+@dataclass
+class FileState:
+    size: int
+    mtime_ns: int
+    offset: int
+    check: int
+    tail: dict = field(default_factory=dict)
+
+
+@dataclass
+class Checkpoint:
+    dir: str
+    engine: str
+    totals: Partial = field(default_factory=Partial)
+    files: dict[str, FileState] = field(default_factory=dict)
+    discarded: bool = False  # load() found a checkpoint but could not use it; never saved.
+
+    @classmethod
+    def load(cls, path: str, dir: str, engine: str, stats: bool = False) -> "Checkpoint":
+        """Read the checkpoint at ``path``; a missing one, or one made for another directory or engine
+        (or without moments when ``stats`` is set), starts empty, the latter two with ``discarded`` set."""
+        dir = os.path.abspath(dir)
+        empty = cls(dir, engine, Partial(stats=RatingStats() if stats else None))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return empty
+        if (data.get("version") != VERSION or data["dir"] != dir or data["engine"] != engine
+                or stats and data.get("moments") is None):
+            empty.discarded = True
+            return empty
+        totals = Partial(data["valid"], data["invalid"], reasons=data["reasons"], stats=_stats(data.get("moments")))
+        for product, (count, rating) in data["products"].items():
+            totals.products[product] = count
+            totals.ratings[product] = rating
+        files = {name: FileState(**state) for name, state in data["files"].items()}
+        return cls(dir, engine, totals, files)
+
+    def save(self, path: str) -> None:
+        """Write the checkpoint atomically (temporary file + ``os.replace``)."""
+        totals = self.totals
+        data = {
+            "version": VERSION, "dir": self.dir, "engine": self.engine,
+            "valid": totals.valid, "invalid": totals.invalid, "reasons": totals.reasons,
+            "products": {product: [count, totals.ratings[product]] for product, count in totals.products.items()},
+            "moments": None if totals.stats is None else totals.stats.moments,
+            "files": {name: asdict(state) for name, state in self.files.items()},
+        }
+        temp = f"{path}.tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp, path)
+
+
+@dataclass
+class Delta:
+    files: int = 0
+    bytes: int = 0
+    rebuilt: bool = False
+
+
+class _Rebuild(Exception):
+    pass
+
+
+def _stats(moments: dict | None) -> RatingStats | None:
+    if moments is None:
+        return None
+    stats = RatingStats()
+    stats.moments = moments
+    return stats
+
+
+def _tail_state(tail: Partial) -> dict:
+    state = asdict(tail)
+    del state["error"]
+    state["stats"] = None if tail.stats is None else tail.stats.moments
+    return state
+
+
+def _tail(state: dict) -> Partial:
+    return Partial(**{**state, "stats": _stats(state.get("stats"))})
+
+
+def _crc_before(file: str, offset: int) -> int:
+    """CRC of the first and last ``CHECK_BYTES`` bytes before ``offset``."""
+    with open(file, "rb") as f:
+        head = f.read(min(offset, CHECK_BYTES))
+        f.seek(max(offset - CHECK_BYTES, 0))
+        return zlib.crc32(f.read(min(offset, CHECK_BYTES)), zlib.crc32(head))
+
+
+def _line_end(file: str, start: int, size: int, block: int = 1 << 16) -> int:
+    """Offset just past the last newline in bytes ``start:size`` (``start`` if there is none)."""
+    with open(file, "rb") as f:
+        end = size
+        while end > start:
+            begin = max(end - block, start)
+            f.seek(begin)
+            newline = f.read(end - begin).rfind(b"\n")
+            if newline >= 0:
+                return begin + newline + 1
+            end = begin
+    return start
+
+
+def _subtract(totals: Partial, tail: Partial) -> None:
+    totals.valid -= tail.valid
+    totals.invalid -= tail.invalid
+    for reason, count in enumerate(tail.reasons):
+        totals.reasons[reason] -= count
+    for product, count in tail.products.items():
+        totals.products[product] -= count
+        totals.ratings[product] -= tail.ratings[product]
+        if not totals.products[product]:
+            del totals.products[product], totals.ratings[product]
+    if totals.stats is not None and tail.stats is not None:
+        totals.stats.subtract(tail.stats)
+
+
+def _apply(state: Checkpoint, pool, engine: str, use_mmap: bool, delta: Delta) -> None:
+    files = list_files(state.dir)
+    if not set(state.files) <= set(files):
+        raise _Rebuild
+    jobs = []
+    for file in files:
+        stat = os.stat(file)
+        old = state.files.get(file)
+        if old is not None:
+            if (stat.st_size, stat.st_mtime_ns) == (old.size, old.mtime_ns):
+                continue
+            if stat.st_size < old.offset or _crc_before(file, old.offset) != old.check:
+                raise _Rebuild
+        start = old.offset if old is not None else 0
+        end = _line_end(file, start, stat.st_size)
+        stats = state.totals.stats is not None
+        body = pool.submit(parse_range, file, start, end, engine, use_mmap, stats) if end > start else None
+        tail = pool.submit(parse_range, file, end, stat.st_size, engine, use_mmap, stats) if stat.st_size > end else None
+        jobs.append((file, stat, old, end, body, tail))
+
+    for file, stat, old, end, body, tail in jobs:
+        parts = [Partial() if future is None else future.result() for future in (body, tail)]
+        failed = next((part.error for part in parts if part.error is not None), None)
+        if failed is not None:
+            if old is not None:
+                raise _Rebuild
+            print(f"Cannot open file {file}\nError: {failed}")
+            continue
+        if old is not None:
+            _subtract(state.totals, _tail(old.tail))
+        merge(state.totals, parts[0])
+        merge(state.totals, parts[1])
+        state.files[file] = FileState(stat.st_size, stat.st_mtime_ns, end, _crc_before(file, end), _tail_state(parts[1]))
+        delta.files += 1
+        delta.bytes += stat.st_size - (old.offset if old is not None else 0)
+
+
+def update(dir: str, path: str, engine: str = "lab", workers: int | None = 0,
+           use_mmap: bool = False, stats: bool = False) -> tuple[Checkpoint, Delta]:
+    """Bring the checkpoint at ``path`` up to date with ``dir`` and save it.
+
+    ``workers=0`` parses in this process; otherwise in a process pool of that
+    size (``None`` = one per CPU).  With ``stats=True`` ``totals.stats`` holds
+    the rating moments of all counted rows.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}; expected one of {', '.join(ENGINES)}")
+    state = Checkpoint.load(path, dir, engine, stats)
+    delta = Delta(rebuilt=state.discarded)
+    with (_InProcess() if workers == 0 else ProcessPoolExecutor(workers)) as pool:
+        try:
+            _apply(state, pool, engine, use_mmap, delta)
+        except _Rebuild:
+            totals = Partial(stats=None if state.totals.stats is None else RatingStats())
+            state, delta = Checkpoint(os.path.abspath(dir), engine, totals), Delta(rebuilt=True)
+            _apply(state, pool, engine, use_mmap, delta)
+    state.save(path)
+    return state, delta
@@ -0,0 +1,156 @@
+"""Compact per-product review counters.
+
+:class:`ProductCounters` replaces the two parallel ``products``/``ratings``
+dicts of Lab-1.py.  New product IDs are interned into integer codes in a
+small write buffer (a dict of codes plus ``array('I')``/``array('Q')``
+columns for counts and rating sums).  When NumPy is installed the buffer
+is regularly folded into sorted NumPy columns: fixed-width ID bytes, count
+(uint32), rating sum (uint64) and first-seen order (uint64), about 30 bytes
+per product for 10-character IDs instead of roughly 170 for two dict
+entries, the key string and int objects.  Without NumPy everything stays
+in the buffer, which still needs only one dict.
+
+:meth:`ProductCounters.top` ranks straight from the columns with the same
+results and tie-breaking as :func:`reviews.stats.top_products`, and
+:meth:`ProductCounters.to_dicts` exports the Lab-1 dicts, so the summary is
+written exactly as before.
+"""
+
+import heapq
+from array import array
+from typing import Iterator
+
+from .stats import TIE_BREAKS
+
+try:
+    import numpy as np
+except ImportError:  # only the write buffer is used
+    np = None
+
+FLUSH_MIN = 1 << 16
+
+
+class ProductCounters:
+    def __init__(self, flush_min: int = FLUSH_MIN) -> None:
+        self.flush_min = flush_min
+        self._seen = 0
+        self._limit = flush_min if np is not None else -1
+        # Write buffer: product -> code, and columns indexed by code.
+        self._codes: dict[str, int] = {}
+        self._counts = array("I")
+        self._sums = array("Q")
+        self._first = array("Q")
+        # Folded columns, sorted by ID.
+        if np is not None:
+            self._ids = np.empty(0, dtype="S1")
+            self._total_counts = np.empty(0, dtype=np.uint32)
+            self._total_sums = np.empty(0, dtype=np.uint64)
+            self._total_first = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        if np is None:
+            return len(self._codes)
+        self.flush()
+        return len(self._ids)
+
+    def add(self, product: str, rating: int, count: int = 1) -> None:
+        """Add ``count`` reviews of ``product`` whose ratings sum to ``rating``."""
+        code = self._codes.get(product)
+        if code is None:
+            code = self._codes[product] = len(self._counts)
+            self._counts.append(0)
+            self._sums.append(0)
+            self._first.append(self._seen)
+            self._seen += 1
+        self._counts[code] += count
+        self._sums[code] += rating
+        if code + 1 == self._limit:
+            self.flush()
+
+    def update(self, products: dict[str, int], ratings: dict[str, int]) -> None:
+        """Add counts and rating sums given as Lab-1 style dicts."""
+        add = self.add
+        for product, count in products.items():
+            add(product, ratings[product], count)
+
+    def flush(self) -> None:
+        """Fold the write buffer into the sorted NumPy columns."""
+        if np is None or not self._codes:
+            return
+        keys = np.array([product.encode("utf-8") for product in self._codes])
+        if keys.dtype.itemsize > self._ids.dtype.itemsize:
+            self._ids = self._ids.astype(keys.dtype)
+        keys = keys.astype(self._ids.dtype)
+        counts = np.frombuffer(self._counts, dtype=np.uint32)
+        sums = np.frombuffer(self._sums, dtype=np.uint64)
+        first = np.frombuffer(self._first, dtype=np.uint64)
+        pos = np.searchsorted(self._ids, keys)
+        found = pos < len(self._ids)
+        found[found] = self._ids[pos[found]] == keys[found]
+        # Buffered IDs are unique, so plain fancy-index addition is safe.
+        self._total_counts[pos[found]] += counts[found]
+        self._total_sums[pos[found]] += sums[found]
+        new = np.flatnonzero(~found)
+        new = new[np.argsort(keys[new], kind="stable")]
+        at = pos[new]
+        self._ids = np.insert(self._ids, at, keys[new])
+        self._total_counts = np.insert(self._total_counts, at, counts[new])
+        self._total_sums = np.insert(self._total_sums, at, sums[new])
+        self._total_first = np.insert(self._total_first, at, first[new])
+        self._codes = {}
+        self._counts, self._sums, self._first = array("I"), array("Q"), array("Q")
+        # Folding copies the columns, so let the buffer grow with them to keep the total cost O(n log n).
+        self._limit = max(self.flush_min, len(self._ids) // 4)
+
+    def items(self) -> Iterator[tuple[str, int, int]]:
+        """``(product, count, rating sum)`` in first-seen order."""
+        if np is None:
+            yield from zip(self._codes, self._counts, self._sums)
+            return
+        self.flush()
+        for i in np.argsort(self._total_first, kind="stable").tolist():
+            yield self._ids[i].decode("utf-8"), int(self._total_counts[i]), int(self._total_sums[i])
+
+    def to_dicts(self) -> tuple[dict[str, int], dict[str, int]]:
+        """The ``products``/``ratings`` dicts Lab-1.py would have built."""
+        products, ratings = {}, {}
+        for product, count, total in self.items():
+            products[product] = count
+            ratings[product] = total
+        return products, ratings
+
+    def top(self, k: int = 3, min_reviews: int = 1, tie_break: str = "first") -> list[tuple[str, float]]:
+        """Same result as ``top_products(*self.to_dicts(), k, min_reviews, tie_break)``."""
+        if tie_break not in TIE_BREAKS:
+            raise ValueError(f"unknown tie_break {tie_break!r}; expected one of {', '.join(TIE_BREAKS)}")
+        if np is None:
+            return self._top_heap(k, min_reviews, tie_break)
+        self.flush()
+        counts, first = self._total_counts, self._total_first
+        eligible = np.flatnonzero(counts >= min_reviews)
+        if k <= 0 or not eligible.size:
+            return []
+        average = self._total_sums[eligible] / counts[eligible]
+        # Everything tied with the k-th best average is a candidate; the tie rule picks among them.
+        if eligible.size > k:
+            kth = np.partition(average, eligible.size - k)[eligible.size - k]
+            keep = average >= kth
+            eligible, average = eligible[keep], average[keep]
+        if tie_break == "first":
+            order = np.lexsort((first[eligible], -average))
+        elif tie_break == "reviews":
+            order = np.lexsort((first[eligible], -counts[eligible].astype(np.int64), -average))
+        else:
+            order = np.lexsort((self._ids[eligible], -average))
+        return [(self._ids[eligible[i]].decode("utf-8"), float(average[i])) for i in order[:k].tolist()]
+
+    def _top_heap(self, k: int, min_reviews: int, tie_break: str) -> list[tuple[str, float]]:
+        averages = ((code, product, count, total / count)
+                    for code, (product, count, total) in enumerate(self.items()) if count >= min_reviews)
+        if tie_break == "first":
+            best = heapq.nsmallest(k, averages, key=lambda item: (-item[3], item[0]))
+        elif tie_break == "reviews":
+            best = heapq.nsmallest(k, averages, key=lambda item: (-item[3], -item[2], item[0]))
+        else:
+            best = heapq.nsmallest(k, averages, key=lambda item: (-item[3], item[1]))
+        return [(product, average) for _, product, _, average in best]
@@ -0,0 +1,173 @@
+"""Parallel ingestion of review files.
+
+Every file, or byte-range shard of a file larger than ``shard_size``, is
+parsed by a process-pool worker into its own ``products``/``ratings``
+counters, streaming the rows through :func:`reviews.reader.iter_rows` so
+memory does not grow with the file.  Shards end right after a newline, so
+no row is split (``use_mmap=True`` finds the cuts and reads the rows through
+a memory map).  The
+partial results are merged in the order ``start()`` in Lab-1.py visits the
+files, which keeps the merged dicts in the same insertion order as the
+serial path (and so the same top-3 tie-breaking).  A file that cannot be
+read or decoded contributes nothing, as in ``read()``.
+
+``engine="lab"`` parses rows with ``process()``; ``engine="regex"`` uses
+:func:`reviews.validate.tally`, which is faster, stricter about dates and
+ratings, and counts invalid rows by :class:`~reviews.validate.Reason`.
+``workers=0`` runs everything in the current process.  Passing a
+:class:`~reviews.counters.ProductCounters` as ``counters`` collects the
+totals there instead of in the ``products``/``ratings`` dicts, so only one
+file's worth of dict entries exists at a time.  Passing a
+:class:`~reviews.stats.RatingStats` as ``stats`` also collects per-product
+rating moments in the same pass.
+"""
+
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from .counters import ProductCounters
+from .reader import find_shards, iter_rows
+from .rows import process
+from .stats import RatingStats
+from .validate import Reason, tally
+
+DEFAULT_SHARD_SIZE = 64 << 20
+
+
+@dataclass
+class Partial:
+    valid: int = 0
+    invalid: int = 0
+    products: dict[str, int] = field(default_factory=dict)
+    ratings: dict[str, int] = field(default_factory=dict)
+    reasons: list[int] = field(default_factory=lambda: [0] * len(Reason))
+    error: str | None = None
+    stats: RatingStats | None = None
+
+
+def list_files(dir: str) -> list[str]:
+    """Files below ``dir`` in the order ``start()`` reads them."""
+    files = []
+    for name in os.listdir(dir):
+        file = os.path.join(dir, name)
+        if os.path.isfile(file):
+            files.append(file)
+        elif os.path.isdir(file):
+            files.extend(list_files(file))
+    return files
+
+
+def tally_lab(rows: Iterable[str], partial: Partial) -> None:
+    stats = partial.stats
+    for row in rows:
+        try:
+            if stats is None:
+                process(row, partial.products, partial.ratings)
+            else:
+                # process() adds exactly one product; count it alone to learn which one and its rating.
+                products, ratings = {}, {}
+                process(row, products, ratings)
+                [(product, _)] = products.items()
+                partial.products[product] = partial.products.get(product, 0) + 1
+                partial.ratings[product] = partial.ratings.get(product, 0) + ratings[product]
+                stats.add(product, ratings[product])
+            partial.valid += 1
+        except Exception:
+            partial.invalid += 1
+
+
+def tally_regex(rows: Iterable[str], partial: Partial) -> None:
+    valid, invalid = tally(rows, partial.products, partial.ratings, partial.reasons, partial.stats)
+    partial.valid += valid
+    partial.invalid += invalid
+
+
+ENGINES = {"lab": tally_lab, "regex": tally_regex}
+
+
+def parse_range(file: str, start: int, end: int, engine: str = "lab", use_mmap: bool = False,
+                stats: bool = False) -> Partial:
+    """Parse the rows in bytes ``start:end`` of ``file`` into local counters (and moments with ``stats=True``).
+
+    On a read or decode error the counters are discarded and only ``error`` is set.
+    """
+    partial = Partial(stats=RatingStats() if stats else None)
+    try:
+        ENGINES[engine](iter_rows(file.replace("\\", "/"), start, end, use_mmap), partial)
+    except Exception as e:
+        return Partial(error=str(e))
+    return partial
+
+
+def merge(total: Partial, partial: Partial) -> None:
+    total.valid += partial.valid
+    total.invalid += partial.invalid
+    for reason, count in enumerate(partial.reasons):
+        total.reasons[reason] += count
+    for product, count in partial.products.items():
+        total.products[product] = total.products.get(product, 0) + count
+        total.ratings[product] = total.ratings.get(product, 0) + partial.ratings[product]
+    if partial.stats is not None:
+        if total.stats is None:
+            total.stats = RatingStats()
+        total.stats.merge(partial.stats)
+
+
+class _InProcess:
+    """Stand-in for the pool when ``workers=0``."""
+
+    def __enter__(self) -> "_InProcess":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+    def submit(self, func, *args) -> Future:
+        future = Future()
+        future.set_result(func(*args))
+        return future
+
+
+def ingest(dir: str, products: dict[str, int], ratings: dict[str, int], workers: int | None = None,
+           shard_size: int = DEFAULT_SHARD_SIZE, engine: str = "lab", reasons: list[int] | None = None,
+           use_mmap: bool = False, counters: ProductCounters | None = None,
+           stats: RatingStats | None = None) -> tuple[int, int]:
+    """Parallel equivalent of ``start(dir, products, ratings)``.
+
+    If ``reasons`` is given, invalid-row counts per :class:`Reason` are added
+    to it (``engine="regex"`` only).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}; expected one of {', '.join(ENGINES)}")
+    files = list_files(dir)
+    total = Partial(products=products, ratings=ratings, reasons=[0] * len(Reason) if reasons is None else reasons,
+                    stats=stats)
+    with (_InProcess() if workers == 0 else ProcessPoolExecutor(workers)) as pool:
+        jobs = []
+        for file in files:
+            try:
+                shards = find_shards(file, shard_size, use_mmap)
+            except OSError as e:
+                jobs.append((file, e))
+                continue
+            jobs.append((file, [pool.submit(parse_range, file, start, end, engine, use_mmap, stats is not None)
+                                for start, end in shards]))
+        for file, futures in jobs:
+            if isinstance(futures, OSError):
+                print(f"Cannot open file {file}\nError: {futures}")
+                continue
+            parts = [future.result() for future in futures]
+            failed = next((part.error for part in parts if part.error is not None), None)
+            if failed is not None:
+                print(f"Cannot open file {file}\nError: {failed}")
+                continue
+            file_total = Partial()
+            for part in parts:
+                merge(file_total, part)
+            if counters is not None:
+                counters.update(file_total.products, file_total.ratings)
+                file_total.products, file_total.ratings = {}, {}
+            merge(total, file_total)
+    return total.valid, total.invalid
@@ -0,0 +1,94 @@
+"""Streaming access to review files in constant memory.
+
+:func:`iter_rows` yields the rows of a file, or of a byte range of it, one
+at a time through a large read buffer, with exactly the decoding and newline
+handling of ``open(file, "r")``.  With ``use_mmap=True`` the bytes come from
+a memory map of the file instead of ``read`` calls, and :func:`find_shards`
+uses the map to cut a file into newline-aligned ranges for parallel workers
+without reading it.
+"""
+
+import io
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator, TextIO
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+class RangeReader(io.RawIOBase):
+    """Raw reader over bytes ``start:end`` of an open binary file or a memory map."""
+
+    def __init__(self, source: "io.BufferedReader | mmap.mmap", start: int, end: int) -> None:
+        self.source = source
+        self.pos = start
+        self.end = end
+        if not isinstance(source, mmap.mmap):
+            source.seek(start)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = min(len(buffer), self.end - self.pos)
+        if n <= 0:
+            return 0
+        if isinstance(self.source, mmap.mmap):
+            buffer[:n] = self.source[self.pos:self.pos + n]
+        else:
+            n = self.source.readinto(memoryview(buffer)[:n])
+        self.pos += n
+        return n
+
+
+@contextmanager
+def open_range(file: str, start: int = 0, end: int | None = None, use_mmap: bool = False,
+               buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[TextIO]:
+    """Open bytes ``start:end`` of ``file`` as a text stream."""
+    with open(file, "rb", buffering=0) as raw:
+        size = os.fstat(raw.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if use_mmap and size:
+            with mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with io.TextIOWrapper(io.BufferedReader(RangeReader(mapped, start, end), buffer_size)) as text:
+                    yield text
+        else:
+            with io.TextIOWrapper(io.BufferedReader(RangeReader(raw, start, end), buffer_size)) as text:
+                yield text
+
+
+def iter_rows(file: str, start: int = 0, end: int | None = None, use_mmap: bool = False,
+              buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[str]:
+    """Yield the rows of ``file`` (or of bytes ``start:end``), like iterating over ``open(file, "r")``."""
+    with open_range(file, start, end, use_mmap, buffer_size) as text:
+        yield from text
+
+
+def find_shards(file: str, shard_size: int, use_mmap: bool = False) -> list[tuple[int, int]]:
+    """Split ``file`` into ``(start, end)`` byte ranges of about ``shard_size`` that end after a newline."""
+    with open(file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= shard_size:
+            return [(0, size)]
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if use_mmap else None
+        try:
+            shards = []
+            start = 0
+            while size - start > shard_size:
+                if mapped is not None:
+                    newline = mapped.find(b"\n", start + shard_size)
+                    end = size if newline < 0 else newline + 1
+                else:
+                    f.seek(start + shard_size)
+                    f.readline()
+                    end = f.tell()
+                if end >= size:
+                    break
+                shards.append((start, end))
+                start = end
+            shards.append((start, size))
+            return shards
+        finally:
+            if mapped is not None:
+                mapped.close()
@@ -0,0 +1,19 @@
+"""Parsing of one review row, shared by the serial and parallel readers."""
+
+import re
+from datetime import datetime
+
+
+def process(row: str, products: dict[str, int], ratings: dict[str, int]) -> None:
+    pattern = re.compile("\"[^\"]*\"")
+    row = re.sub(pattern, "", row).strip().split()
+    if len(row) > 4:
+        raise ValueError("Extra Values")
+    if len(row[0]) == 6 or row[0].isalnum():
+        if len(row[1]) == 10 or row[1].isalnum():
+            if datetime.strptime(row[2], "%Y-%m-%d"):
+                if 1 <= int(row[3]) <= 5:
+                    products[row[1]] = products.get(row[1], 0) + 1
+                    ratings[row[1]] = ratings.get(row[1], 0) + int(row[3])
+                    return
+    raise ValueError("Some Error")
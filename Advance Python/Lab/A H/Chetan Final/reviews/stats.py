@@ -0,0 +1,124 @@
+"""Top-K ranking and streaming rating statistics per product.
+
+:func:`top_products` picks the best averages with :func:`heapq.nlargest` /
+:func:`heapq.nsmallest` over a generator, so ranking needs O(k) memory on
+top of the counters instead of an ``average`` dict and a full sort.  With
+the default ``tie_break="first"`` the result is exactly
+``sorted(average, reverse=True, key=average.get)[:k]`` as in Lab-1.py.
+
+:class:`RatingStats` keeps count, mean and the sum of squared deviations
+per product with Welford's update, and merges partial results (e.g. from
+workers) with Chan's formula, so variance never needs a second pass or the
+individual ratings.  The ingest paths fill one in the same pass as the
+counters when asked to (``stats=`` of :func:`reviews.ingest.ingest`,
+:func:`reviews.checkpoint.update` and :func:`reviews.cache.aggregate`).
+"""
+
+import heapq
+import math
+from typing import Iterable, Iterator
+
+from .validate import Reason, validate
+
+TIE_BREAKS = ("first", "reviews", "id")
+
+
+def top_products(products: dict[str, int], ratings: dict[str, int], k: int = 3, min_reviews: int = 1,
+                 tie_break: str = "first") -> list[tuple[str, float]]:
+    """The ``k`` products with the highest average rating, as ``(product, average)``.
+
+    Products with fewer than ``min_reviews`` valid reviews are skipped.
+    Equal averages are ordered by ``tie_break``: ``"first"`` keeps the order
+    of the counters, ``"reviews"`` puts more-reviewed products first (then
+    counter order), ``"id"`` orders by product ID.
+    """
+    averages = ((p, ratings[p] / n) for p, n in products.items() if n >= min_reviews)
+    if tie_break == "first":
+        return heapq.nlargest(k, averages, key=lambda item: item[1])
+    if tie_break == "reviews":
+        return heapq.nlargest(k, averages, key=lambda item: (item[1], products[item[0]]))
+    if tie_break == "id":
+        return heapq.nsmallest(k, averages, key=lambda item: (-item[1], item[0]))
+    raise ValueError(f"unknown tie_break {tie_break!r}; expected one of {', '.join(TIE_BREAKS)}")
+
+
+class RatingStats:
+    """Per-product count, mean and variance of the ratings, updated one rating at a time."""
+
+    def __init__(self) -> None:
+        # product -> [count, mean, sum of squared deviations from the mean]
+        self.moments: dict[str, list[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.moments)
+
+    def add(self, product: str, rating: float) -> None:
+        moments = self.moments.get(product)
+        if moments is None:
+            self.moments[product] = [1, float(rating), 0.0]
+            return
+        moments[0] += 1
+        delta = rating - moments[1]
+        moments[1] += delta / moments[0]
+        moments[2] += delta * (rating - moments[1])
+
+    def add_moments(self, product: str, n_b: int, mean_b: float, m2_b: float) -> None:
+        """Merge in ``n_b`` ratings of ``product`` given by their mean and sum of squared deviations."""
+        moments = self.moments.get(product)
+        if moments is None:
+            self.moments[product] = [n_b, mean_b, m2_b]
+            return
+        n_a, mean_a, m2_a = moments
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        moments[:] = [n, mean_a + delta * n_b / n, m2_a + m2_b + delta * delta * n_a * n_b / n]
+
+    def merge(self, other: "RatingStats") -> None:
+        for product, moments in other.moments.items():
+            self.add_moments(product, *moments)
+
+    def subtract(self, other: "RatingStats") -> None:
+        """Undo :meth:`merge` of ``other`` (Chan's formula solved for the first part)."""
+        for product, (n_b, mean_b, m2_b) in other.moments.items():
+            n, mean, m2 = self.moments[product]
+            n_a = n - n_b
+            if n_a <= 0:
+                del self.moments[product]
+                continue
+            mean_a = (n * mean - n_b * mean_b) / n_a
+            delta = mean_b - mean_a
+            self.moments[product] = [n_a, mean_a, max(m2 - m2_b - delta * delta * n_a * n_b / n, 0.0)]
+
+    def count(self, product: str) -> int:
+        return int(self.moments[product][0])
+
+    def mean(self, product: str) -> float:
+        return self.moments[product][1]
+
+    def variance(self, product: str, sample: bool = False) -> float:
+        """Population variance, or the sample variance (n - 1) with ``sample=True`` (NaN for one review)."""
+        n, _, m2 = self.moments[product]
+        if sample:
+            return m2 / (n - 1) if n > 1 else math.nan
+        return m2 / n
+
+    def stdev(self, product: str, sample: bool = False) -> float:
+        return math.sqrt(self.variance(product, sample))
+
+    def top(self, k: int = 3, min_reviews: int = 1) -> list[tuple[str, float]]:
+        """Highest mean ratings; ties go to the product with more reviews, then to the one seen first."""
+        means = ((p, m[1], m[0]) for p, m in self.moments.items() if m[0] >= min_reviews)
+        return [(p, mean) for p, mean, _ in heapq.nlargest(k, means, key=lambda item: (item[1], item[2]))]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.moments)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[str]) -> "RatingStats":
+        """Statistics of the rows accepted by :func:`reviews.validate.validate`."""
+        stats = cls()
+        for row in rows:
+            reason, review = validate(row)
+            if reason == Reason.OK:
+                stats.add(review.product, review.rating)
+        return stats
@@ -0,0 +1,108 @@
+"""Single-pass validation of review rows with reason codes.
+
+A row is ``<reviewer> <product> <YYYY-MM-DD> <rating> ["comment"]``.  One
+precompiled regex splits it into those five fields; the fields are then
+checked with plain string tests, so an invalid row gets a :class:`Reason`
+instead of raising.  Compared to ``process()``:
+
+* reviewer and product IDs are accepted by the same rule (``len == 6`` /
+  ``len == 10`` or alphanumeric);
+* the date must be exactly ``YYYY-MM-DD`` with zero-padded month and day
+  and a day that exists in that month (``strptime`` also takes ``2024-1-5``);
+* the rating must be a single digit 1-5 (``int()`` also takes ``05``, ``+5``);
+* the comment, if any, must come last.
+"""
+
+import re
+from enum import IntEnum
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+if TYPE_CHECKING:
+    from .stats import RatingStats
+
+ROW = re.compile(r'\s*([^\s"]+)\s+([^\s"]+)\s+([^\s"]+)\s+([^\s"]+)\s*(?:"([^"]*)"\s*)?')
+BLANK = re.compile(r"\s*")
+DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+class Reason(IntEnum):
+    OK = 0
+    BLANK = 1
+    SHAPE = 2
+    REVIEWER = 3
+    PRODUCT = 4
+    DATE = 5
+    RATING = 6
+
+
+class Review(NamedTuple):
+    reviewer: str
+    product: str
+    date: str
+    rating: int
+    comment: str | None
+
+
+def valid_date(date: str) -> bool:
+    """``YYYY-MM-DD`` with ASCII digits, checked by position and against the calendar."""
+    if len(date) != 10 or date[4] != "-" or date[7] != "-" or not date.isascii():
+        return False
+    year, month, day = date[:4], date[5:7], date[8:]
+    if not (year.isdigit() and month.isdigit() and day.isdigit()):
+        return False
+    year, month, day = int(year), int(month), int(day)
+    if year < 1 or not 1 <= month <= 12 or not 1 <= day <= DAYS_IN_MONTH[month]:
+        return False
+    return month != 2 or day < 29 or year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def check(reviewer: str, product: str, date: str, rating: str) -> Reason:
+    if not (len(reviewer) == 6 or reviewer.isalnum()):
+        return Reason.REVIEWER
+    if not (len(product) == 10 or product.isalnum()):
+        return Reason.PRODUCT
+    if not valid_date(date):
+        return Reason.DATE
+    if len(rating) != 1 or rating not in "12345":
+        return Reason.RATING
+    return Reason.OK
+
+
+def validate(row: str) -> tuple[Reason, Review | None]:
+    match = ROW.fullmatch(row)
+    if match is None:
+        return (Reason.BLANK if BLANK.fullmatch(row) else Reason.SHAPE), None
+    reviewer, product, date, rating, comment = match.groups()
+    reason = check(reviewer, product, date, rating)
+    if reason:
+        return reason, None
+    return reason, Review(reviewer, product, date, int(rating), comment)
+
+
+def tally(rows: Iterable[str], products: dict[str, int], ratings: dict[str, int],
+          reasons: list[int] | None = None, stats: "RatingStats | None" = None) -> tuple[int, int]:
+    """Count valid rows into ``products``/``ratings`` and every row into ``reasons``.
+
+    ``reasons`` is indexed by :class:`Reason` and accumulates across calls;
+    the returned ``(valid, invalid)`` covers only ``rows``.  Valid ratings are
+    also added to ``stats`` if given.
+    """
+    if reasons is None:
+        reasons = [0] * len(Reason)
+    valid, total = reasons[Reason.OK], sum(reasons)
+    fullmatch = ROW.fullmatch
+    for row in rows:
+        match = fullmatch(row)
+        if match is None:
+            reasons[Reason.BLANK if BLANK.fullmatch(row) else Reason.SHAPE] += 1
+            continue
+        reviewer, product, date, rating, _ = match.groups()
+        reason = check(reviewer, product, date, rating)
+        reasons[reason] += 1
+        if not reason:
+            products[product] = products.get(product, 0) + 1
+            ratings[product] = ratings.get(product, 0) + int(rating)
+            if stats is not None:
+                stats.add(product, int(rating))
+    valid = reasons[Reason.OK] - valid
+    return valid, sum(reasons) - total - valid
@@ -1,9 +1,27 @@
+import atexit
+import os
 import random
-from datetime import datetime
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cipher.history import AsyncHistoryWriter, HistoryStore
+
+PAGE_SIZE = 10
+
+history_writer = None
+
+def open_history():
+    history = HistoryStore("cipher_history")
+    if len(history) == 0 and os.path.exists("cipher_history.log"):
+        history.import_log("cipher_history.log")
+    return AsyncHistoryWriter(history)
 
 def log_action(action, key, input_text, output_text):
-    with open("cipher_history.log", "a") as log_file:
-        log_file.write(f"{datetime.now()} | {action} | Key: {key} | Input: {input_text} | Output: {output_text}\n")
+    if history_writer is not None:
+        try:
+            history_writer.log(action, key, input_text, output_text)
+        except ValueError as e:
+            print(f"Not logged: {e}")
 
 def encrypt_char(ch, key):
     if ch.islower():
@@ -46,51 +64,75 @@ def show_menu():
     print("5. View log history")
     print("6. Exit")
 
-while True:
-    show_menu()
-    choice = input("Choose an option: ")
-
-    if choice == '1':
-        plain_text = input("Enter the text to encrypt: ")
-        key = int(input("Enter the key (1-25): "))
-        cipher_text = encrypt_text(plain_text, key)
-        log_action("Manual Encrypt", key, plain_text, cipher_text)
-        print("Encrypted Text:", cipher_text)
-
-    elif choice == '2':
-        plain_text = input("Enter the text to encrypt: ")
-        key = random.randint(1, 25)
-        cipher_text = encrypt_text(plain_text, key)
-        log_action("Random Encrypt", key, plain_text, cipher_text)
-        print(f"Encrypted Text: {cipher_text} (Key: {key})")
-
-    elif choice == '3':
-        plain_text = input("Enter the full sentence: ")
-        key = int(input("Enter the key (1-25): "))
-        specific_words = input("Enter the words to encrypt (comma separated): ").split(',')
-        specific_words = [w.strip() for w in specific_words]
-        cipher_text = selective_encrypt(plain_text, key, specific_words)
-        log_action("Selective Encrypt", key, plain_text, cipher_text)
-        print("Encrypted Text:", cipher_text)
-
-    elif choice == '4':
-        cipher_text = input("Enter the text to decrypt: ")
-        key = int(input("Enter the key used during encryption: "))
-        decrypted_text = decrypt_text(cipher_text, key)
-        log_action("Decrypt", key, cipher_text, decrypted_text)
-        print("Decrypted Text:", decrypted_text)
-
-    elif choice == '5':
-        print("\n--- Cipher History Log ---")
-        try:
-            with open("cipher_history.log", "r") as log_file:
-                print(log_file.read())
-        except FileNotFoundError:
-            print("No log history found.")
+def main():
+    global history_writer
+    history_writer = open_history()
+    atexit.register(history_writer.close)
+    history = history_writer.store
 
-    elif choice == '6':
-        print("Exited.")
-        break
+    while True:
+        show_menu()
+        choice = input("Choose an option: ")
 
-    else:
-        print("Invalid choice. Please try again.")
+        if choice == '1':
+            plain_text = input("Enter the text to encrypt: ")
+            key = int(input("Enter the key (1-25): "))
+            cipher_text = encrypt_text(plain_text, key)
+            log_action("Manual Encrypt", key, plain_text, cipher_text)
+            print("Encrypted Text:", cipher_text)
+
+        elif choice == '2':
+            plain_text = input("Enter the text to encrypt: ")
+            key = random.randint(1, 25)
+            cipher_text = encrypt_text(plain_text, key)
+            log_action("Random Encrypt", key, plain_text, cipher_text)
+            print(f"Encrypted Text: {cipher_text} (Key: {key})")
+
+        elif choice == '3':
+            plain_text = input("Enter the full sentence: ")
+            key = int(input("Enter the key (1-25): "))
+            specific_words = input("Enter the words to encrypt (comma separated): ").split(',')
+            specific_words = [w.strip() for w in specific_words]
+            cipher_text = selective_encrypt(plain_text, key, specific_words)
+            log_action("Selective Encrypt", key, plain_text, cipher_text)
+            print("Encrypted Text:", cipher_text)
+
+        elif choice == '4':
+            cipher_text = input("Enter the text to decrypt: ")
+            key = int(input("Enter the key used during encryption: "))
+            decrypted_text = decrypt_text(cipher_text, key)
+            log_action("Decrypt", key, cipher_text, decrypted_text)
+            print("Decrypted Text:", decrypted_text)
+
+        elif choice == '5':
+            print("\n--- Cipher History Log ---")
+            history_writer.flush()
+            if len(history) == 0:
+                print("No log history found.")
+            page = 1
+            while len(history):
+                for entry in history.page(page, PAGE_SIZE):
+                    print(entry)
+                pages = history.pages(PAGE_SIZE)
+                move = input(f"-- Page {page} of {pages} -- (n = older, p = newer, Enter = back): ").strip().lower()
+                if move == 'n' and page < pages:
+                    page += 1
+                elif move == 'p' and page > 1:
+                    page -= 1
+                else:
+                    break
+
+        elif choice == '6':
+            history_writer.close()
+            if history_writer.dropped:
+                print(f"Warning: {history_writer.dropped} log entries were dropped.")
+            if history_writer.failed:
+                print(f"Warning: {history_writer.failed} log entries could not be written.")
+            print("Exited.")
+            break
+
+        else:
+            print("Invalid choice. Please try again.")
+
+if __name__ == "__main__":
+    main()
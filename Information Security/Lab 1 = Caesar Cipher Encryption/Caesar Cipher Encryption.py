@@ -19,11 +19,14 @@ def encryptCipher(plainText, key) :
             cipher += ch
         
     return cipher
-    
 
-plainText = input("Enter the plain Text here : ")
-key = input("Enter the integer key Value here : ")
-cipherText = encryptCipher(plainText, key)
-print("Cipher Text:", cipherText)
+
+def main():
+    plainText = input("Enter the plain Text here : ")
+    key = input("Enter the integer key Value here : ")
+    cipherText = encryptCipher(plainText, key)
+    print("Cipher Text:", cipherText)
 
 
+if __name__ == "__main__":
+    main()
@@ -74,13 +74,19 @@ def decrypt(cipher, matrix):
         plain += decrypt_pair(cipher[i], cipher[i+1], matrix)
     return plain
 
-key = input("Enter key: ")
-text = input("Enter plaintext: ")
 
-matrix = generate_matrix(key)  
+def main():
+    key = input("Enter key: ")
+    text = input("Enter plaintext: ")
 
-cipher_text = encrypt(text, matrix)
-print("\nEncrypted Text:", cipher_text)
+    matrix = generate_matrix(key)  
 
-plain_text = decrypt(cipher_text, matrix)
-print("Decrypted Text:", plain_text)
+    cipher_text = encrypt(text, matrix)
+    print("\nEncrypted Text:", cipher_text)
+
+    plain_text = decrypt(cipher_text, matrix)
+    print("Decrypted Text:", plain_text)
+
+
+if __name__ == "__main__":
+    main()
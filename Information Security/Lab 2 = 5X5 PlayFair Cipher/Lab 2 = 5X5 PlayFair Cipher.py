@@ -86,17 +86,22 @@ def playfair_decrypt(ciphertext, key):
     return decrypted
 
 
-choice = input("Enter E to Encrypt or D to Decrypt: ").strip().upper()
-key = input("Enter the key: ").strip()
-message = input("Enter the message: ").strip()
-
-if choice == 'E':
-    encrypted = playfair_encrypt(message, key)
-    print("Encrypted message:", encrypted)
-elif choice == 'D':
-    decrypted = playfair_decrypt(message, key)
-    print("Decrypted message:", decrypted)
-else:
-    print("Invalid choice.")
+def main():
+    choice = input("Enter E to Encrypt or D to Decrypt: ").strip().upper()
+    key = input("Enter the key: ").strip()
+    message = input("Enter the message: ").strip()
+
+    if choice == 'E':
+        encrypted = playfair_encrypt(message, key)
+        print("Encrypted message:", encrypted)
+    elif choice == 'D':
+        decrypted = playfair_decrypt(message, key)
+        print("Decrypted message:", decrypted)
+    else:
+        print("Invalid choice.")
     
-    # I am don
+        # I am don
+
+
+if __name__ == "__main__":
+    main()
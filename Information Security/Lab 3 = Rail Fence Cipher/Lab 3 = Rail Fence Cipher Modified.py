@@ -65,12 +65,16 @@ def decrypt_rail_fence_unicode(cipher, key):
     return ''.join(result)
 
 
+def main():
+    message = input("🔤 Enter message to encrypt (any language or emoji supported): ")
+    rails = int(input("🔢 Enter number of rails: "))
 
-message = input("🔤 Enter message to encrypt (any language or emoji supported): ")
-rails = int(input("🔢 Enter number of rails: "))
+    encrypted = encrypt_rail_fence_unicode(message, rails)
+    print("\n🔐 Encrypted:", encrypted)
 
-encrypted = encrypt_rail_fence_unicode(message, rails)
-print("\n🔐 Encrypted:", encrypted)
+    decrypted = decrypt_rail_fence_unicode(encrypted, rails)
+    print("🔓 Decrypted:", decrypted)
 
-decrypted = decrypt_rail_fence_unicode(encrypted, rails)
-print("🔓 Decrypted:", decrypted)
+
+if __name__ == "__main__":
+    main()
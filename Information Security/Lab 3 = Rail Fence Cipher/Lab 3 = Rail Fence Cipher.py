@@ -64,11 +64,16 @@ def decrypt_rail_fence(cipher, key):
     return "".join(result)
 
 
-text = input("Enter the message: ").replace(" ", "")
-key = int(input("Enter the number of rails (key): "))
+def main():
+    text = input("Enter the message: ").replace(" ", "")
+    key = int(input("Enter the number of rails (key): "))
 
-cipher_text = encrypt_rail_fence(text, key)
-print("\nEncrypted Text:", cipher_text)
+    cipher_text = encrypt_rail_fence(text, key)
+    print("\nEncrypted Text:", cipher_text)
 
-decrypted_text = decrypt_rail_fence(cipher_text, key)
-print("Decrypted Text:", decrypted_text)
+    decrypted_text = decrypt_rail_fence(cipher_text, key)
+    print("Decrypted Text:", decrypted_text)
+
+
+if __name__ == "__main__":
+    main()
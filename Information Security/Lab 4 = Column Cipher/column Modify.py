@@ -15,28 +15,34 @@ def create_matrix(message, key_len):
 def transpose(matrix):
     return list(map(list, zip(*matrix)))
 
-message = input("Enter the message: ")
-base_key = input("Enter the base key (e.g. numbers or letters): ")
-
-now = datetime.now()
-seconds = now.second
-rotation = seconds % len(base_key)
-rotated_key = base_key[rotation:] + base_key[:rotation]
-
-print("Current Time:", now.strftime("%H:%M:%S"))
-print("Seconds:", seconds)
-print("Rotation Value:", rotation)
-print("Rotated Key:", rotated_key)
-
-matrix = create_matrix(message, len(rotated_key))
-print("Matrix:")
-for row in matrix:
-    print(row)
-
-transposed = transpose(matrix)
-print("Transposed Matrix:")
-for row in transposed:
-    print(row)
-
-final = ''.join([''.join(row) for row in transposed])
-print("Final Cipher Text:", final)
+
+def main():
+    message = input("Enter the message: ")
+    base_key = input("Enter the base key (e.g. numbers or letters): ")
+
+    now = datetime.now()
+    seconds = now.second
+    rotation = seconds % len(base_key)
+    rotated_key = base_key[rotation:] + base_key[:rotation]
+
+    print("Current Time:", now.strftime("%H:%M:%S"))
+    print("Seconds:", seconds)
+    print("Rotation Value:", rotation)
+    print("Rotated Key:", rotated_key)
+
+    matrix = create_matrix(message, len(rotated_key))
+    print("Matrix:")
+    for row in matrix:
+        print(row)
+
+    transposed = transpose(matrix)
+    print("Transposed Matrix:")
+    for row in transposed:
+        print(row)
+
+    final = ''.join([''.join(row) for row in transposed])
+    print("Final Cipher Text:", final)
+
+
+if __name__ == "__main__":
+    main()
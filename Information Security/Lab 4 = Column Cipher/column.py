@@ -16,7 +16,13 @@ def encrypt_columnar(message, key):
             ciphertext += r[idx]
     return ciphertext
 
-msg = input("Enter message: ")
-key = input("Enter key: ")
-cipher = encrypt_columnar(msg, key)
-print("Ciphertext:", cipher)
+
+def main():
+    msg = input("Enter message: ")
+    key = input("Enter key: ")
+    cipher = encrypt_columnar(msg, key)
+    print("Ciphertext:", cipher)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""Importable versions of the Information Security lab ciphers.
+
+Submodules are loaded on first attribute access (``cipher.playfair`` etc.),
+so ``import cipher`` itself costs next to nothing.
+"""
+
+import importlib
+
+__all__ = ["batch", "caesar", "caesar_crack", "columnar", "history", "pipeline", "playfair", "railfence",
+           "railfence_crack", "selective", "stream"]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
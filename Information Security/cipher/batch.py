@@ -0,0 +1,237 @@
+"""Encrypt or decrypt batches of files on all cores.
+
+Files are spread over a :class:`~concurrent.futures.ProcessPoolExecutor`.
+The key is compiled once per worker by the pool initializer (Caesar byte
+table, Playfair digraph tables, Columnar column order) instead of once per
+task.  Caesar is position independent, so files larger than ``chunk_size``
+are also split into chunks that different workers translate and write with
+``pwrite`` straight into their place in the output; the other ciphers work
+on whole files.
+
+Each output is written to a temporary file next to its destination and
+moved into place with :func:`os.replace` once complete, so readers never see
+a partial file and a failed file leaves nothing behind.  Outputs get the
+permissions the umask gives a newly created file, not the 0600 of
+:func:`tempfile.mkstemp`.
+"""
+
+import glob
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .caesar import byte_table
+from .columnar import ColumnarCipher
+from .playfair import PlayfairCipher
+from .railfence import decrypt_rail_fence, encrypt_rail_fence
+
+ALGORITHMS = ("caesar", "playfair", "railfence", "columnar")
+DEFAULT_CHUNK_SIZE = 4 << 20
+
+_transform: Callable[[bytes], bytes] | None = None
+
+
+def compile_transform(algo: str, key: str, decrypt: bool = False) -> Callable[[bytes], bytes]:
+    """Build the bytes -> bytes function for one algorithm and key."""
+    if algo == "caesar":
+        table = byte_table(-int(key) if decrypt else int(key))
+        return lambda data: data.translate(table)
+    if algo == "railfence":
+        rails = int(key)
+        func = decrypt_rail_fence if decrypt else encrypt_rail_fence
+        return lambda data: func(data.decode("utf-8"), rails).encode("utf-8")
+    if algo == "playfair":
+        cipher = PlayfairCipher(key)
+    elif algo == "columnar":
+        cipher = ColumnarCipher(key)
+    else:
+        raise ValueError(f"unknown algorithm {algo!r}; expected one of {', '.join(ALGORITHMS)}")
+    func = cipher.decrypt if decrypt else cipher.encrypt
+    return lambda data: func(data.decode("utf-8")).encode("utf-8")
+
+
+def _init_worker(algo: str, key: str, decrypt: bool) -> None:
+    global _transform
+    _transform = compile_transform(algo, key, decrypt)
+
+
+def _pwrite(fd: int, data: bytes, offset: int) -> None:
+    if hasattr(os, "pwrite"):
+        while data:
+            written = os.pwrite(fd, data, offset)
+            data, offset = data[written:], offset + written
+    else:
+        os.lseek(fd, offset, os.SEEK_SET)
+        while data:
+            data = data[os.write(fd, data):]
+
+
+def _run_file(source: str, temp: str) -> tuple[int, int, float]:
+    """Transform a whole file into ``temp``; returns (pid, bytes read, busy seconds)."""
+    start = time.perf_counter()
+    with open(source, "rb") as src:
+        data = src.read()
+    # The temporary file already exists; never recreate one the parent has removed.
+    with open(temp, "r+b") as dst:
+        dst.write(_transform(data))
+    return os.getpid(), len(data), time.perf_counter() - start
+
+
+def _run_chunk(source: str, temp: str, offset: int, length: int) -> tuple[int, int, float]:
+    """Translate one Caesar chunk of ``source`` into the same range of ``temp``."""
+    start = time.perf_counter()
+    with open(source, "rb") as src:
+        src.seek(offset)
+        data = src.read(length)
+    fd = os.open(temp, os.O_WRONLY | getattr(os, "O_BINARY", 0))
+    try:
+        _pwrite(fd, _transform(data), offset)
+    finally:
+        os.close(fd)
+    return os.getpid(), len(data), time.perf_counter() - start
+
+
+def collect_files(sources: Iterable[str]) -> list[tuple[Path, Path]]:
+    """Expand directories (recursively), glob patterns and plain files.
+
+    Returns ``(file, relative output path)`` pairs: files found under a
+    directory keep their path below it, everything else keeps its name.
+    """
+    found: dict[Path, Path] = {}
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            pairs = [(file, file.relative_to(path)) for file in sorted(path.rglob("*")) if file.is_file()]
+        elif glob.has_magic(source):
+            matches = [Path(match) for match in sorted(glob.glob(source, recursive=True))]
+            if not matches:
+                raise FileNotFoundError(f"no files match {source}")
+            pairs = [(match, Path(match.name)) for match in matches if match.is_file()]
+        elif path.is_file():
+            pairs = [(path, Path(path.name))]
+        else:
+            raise FileNotFoundError(f"no such file or directory: {source}")
+        for file, relative in pairs:
+            if relative in found and found[relative] != file:
+                raise ValueError(f"{found[relative]} and {file} would both be written to {relative}")
+            found[relative] = file
+    return [(file, relative) for relative, file in found.items()]
+
+
+@dataclass
+class WorkerStats:
+    tasks: int = 0
+    bytes: int = 0
+    busy: float = 0.0
+
+
+@dataclass
+class BatchReport:
+    files: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    workers: dict[int, WorkerStats] = field(default_factory=dict)
+    failed: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes / self.seconds / 1e6 if self.seconds else float("inf")
+
+    def __str__(self) -> str:
+        lines = [f"{self.files:,} files, {self.bytes:,} bytes in {self.seconds:.3f} s ({self.mb_per_s:,.2f} MB/s)"]
+        for pid, stats in sorted(self.workers.items()):
+            utilization = stats.busy / self.seconds if self.seconds else 0.0
+            lines.append(f"  worker {pid:>7}: {stats.tasks:6,} tasks {stats.bytes:>14,} bytes  "
+                         f"busy {stats.busy:8.3f} s ({utilization:6.1%})")
+        lines.extend(f"  FAILED {name}: {error}" for name, error in self.failed.items())
+        return "\n".join(lines)
+
+
+def _file_mode() -> int:
+    """Mode ``open()`` would give a new file under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _temp_for(target: Path, mode: int) -> str:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+    os.close(fd)
+    # os.chmod on the path, not os.fchmod: the latter is missing on Windows before Python 3.13.
+    try:
+        os.chmod(temp, mode)
+    except OSError:
+        os.unlink(temp)
+        raise
+    return temp
+
+
+def process_batch(sources: Iterable[str], output_dir: str, algo: str, key: str, decrypt: bool = False,
+                  workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE, suffix: str = "") -> BatchReport:
+    """Encrypt (or decrypt) every file in ``sources`` into ``output_dir``.
+
+    ``suffix`` is appended to each output name (e.g. ``".enc"``).  A file
+    that fails is reported in :attr:`BatchReport.failed` and its temporary
+    output removed; the other files are still written.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    compile_transform(algo, key, decrypt)  # Reject a bad key here rather than in every worker.
+    files = collect_files(sources)
+    mode = _file_mode()
+    report = BatchReport()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(algo, key, decrypt)) as pool:
+        jobs = []
+        try:
+            for source, relative in files:
+                target = Path(output_dir) / relative.with_name(relative.name + suffix)
+                try:
+                    size = source.stat().st_size
+                except OSError as err:
+                    report.failed[str(source)] = f"{type(err).__name__}: {err}"
+                    continue
+                futures = []
+                temp = _temp_for(target, mode)
+                jobs.append((source, target, temp, futures))
+                if algo == "caesar" and size > chunk_size:
+                    os.truncate(temp, size)
+                    futures.extend(pool.submit(_run_chunk, str(source), temp, offset, min(chunk_size, size - offset))
+                                   for offset in range(0, size, chunk_size))
+                else:
+                    futures.append(pool.submit(_run_file, str(source), temp))
+
+            for source, target, temp, futures in jobs:
+                try:
+                    done = 0
+                    for future in futures:
+                        pid, size, busy = future.result()
+                        stats = report.workers.setdefault(pid, WorkerStats())
+                        stats.tasks += 1
+                        stats.bytes += size
+                        stats.busy += busy
+                        done += size
+                    os.replace(temp, target)
+                    report.files += 1
+                    report.bytes += done
+                except Exception as err:
+                    for future in futures:
+                        future.cancel()
+                    report.failed[str(source)] = f"{type(err).__name__}: {err}"
+                    os.unlink(temp)
+        except BaseException:
+            # Nothing is moved into place after this; drop the temporary outputs still around.
+            for _, _, temp, futures in jobs:
+                for future in futures:
+                    future.cancel()
+                with suppress(FileNotFoundError):
+                    os.unlink(temp)
+            raise
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,127 @@
+"""Micro-benchmarks comparing the cipher package against the lab scripts.
+
+Run from the "Information Security" directory::
+
+    python -m cipher.bench --size 4M
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import random
+import string
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from . import caesar, playfair, selective
+from .cli import parse_size
+
+LABS = Path(__file__).resolve().parent.parent
+ALPHABET = string.ascii_letters + "     .,!?'"
+
+
+def load_lab(relpath: str, *names: str) -> tuple[Callable[..., Any], ...]:
+    """Load function definitions from a lab script without running its input() prompts."""
+    path = LABS / relpath
+    tree = ast.parse(path.read_text(encoding="utf-8"), str(path))
+    tree.body = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef))]
+    namespace: dict[str, Any] = {}
+    exec(compile(tree, str(path), "exec"), namespace)
+    return tuple(namespace[name] for name in names)
+
+
+def quiet(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a lab function so whatever it prints is discarded."""
+    def run(*args: Any) -> Any:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func(*args)
+    return run
+
+
+def sample_text(size: int, seed: int = 0) -> str:
+    return "".join(random.Random(seed).choices(ALPHABET, k=size))
+
+
+def best_time(func: Callable[..., Any], *args: Any, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name: str, seconds: float, size: int, baseline: float | None = None) -> None:
+    speedup = f"  x{baseline / seconds:,.1f}" if baseline else ""
+    print(f"{name:<40} {seconds * 1000:10.2f} ms  {size / seconds / 1e6:10.2f} MB/s{speedup}")
+
+
+def bench_caesar(size: int, key: int = 3, repeat: int = 3) -> None:
+    (legacy_encrypt_text,) = load_lab("Lab 1 = Caesar Cipher Encryption/Caesar Cipher Encryption Modifed.py", "encrypt_text")
+    (encrypt_cipher,) = load_lab("Lab 1 = Caesar Cipher Encryption/Caesar Cipher Encryption.py", "encryptCipher")
+    text = sample_text(size)
+    data = text.encode("ascii")
+    assert caesar.encrypt_text(text, key) == legacy_encrypt_text(text, key)
+
+    print(f"\nCaesar, {size:,} bytes, key {key}")
+    baseline = best_time(legacy_encrypt_text, text, key, repeat=repeat)
+    report("lab encrypt_text (per char)", baseline, size)
+    report("lab encryptCipher (+=)", best_time(encrypt_cipher, text, key, repeat=repeat), size, baseline)
+    report("caesar.encrypt_text (str.translate)", best_time(caesar.encrypt_text, text, key, repeat=repeat), size, baseline)
+    report("caesar.encrypt_bytes (bytes.translate)", best_time(caesar.encrypt_bytes, data, key, repeat=repeat), size, baseline)
+
+
+def bench_selective(size: int, watchlist: int = 1000, key: int = 3, repeat: int = 3) -> None:
+    (legacy_selective,) = load_lab("Lab 1 = Caesar Cipher Encryption/Caesar Cipher Encryption Modifed.py", "selective_encrypt")
+    rng = random.Random(0)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(watchlist * 5)]
+    words = rng.sample(vocabulary, watchlist)
+    text = " ".join(rng.choices(vocabulary, k=size // 7))
+    assert selective.selective_encrypt(text, key, words) == legacy_selective(text, key, words)
+
+    print(f"\nSelective encryption, {len(text):,} bytes, {watchlist} watched words")
+    baseline = best_time(legacy_selective, text, key, words, repeat=repeat)
+    report("lab selective_encrypt (list scan)", baseline, len(text))
+    cipher = selective.SelectiveCipher(words, key)
+    report("SelectiveCipher.encrypt (trie regex)", best_time(cipher.encrypt, text, repeat=repeat), len(text), baseline)
+
+
+def bench_playfair(size: int, legacy_size: int, key: str = "PLAYFAIR EXAMPLE", repeat: int = 1) -> None:
+    legacy_encrypt, legacy_decrypt = map(quiet, load_lab("Lab 2 = 5X5 PlayFair Cipher/Lab 2 = 5X5 PlayFair Cipher.py",
+                                                         "playfair_encrypt", "playfair_decrypt"))
+    text = sample_text(size)
+    cipher = playfair.PlayfairCipher(key)
+    sample = text[:1 << 16]
+    assert cipher.decrypt(cipher.encrypt(sample)) == legacy_decrypt(legacy_encrypt(sample, key), key)
+
+    # The lab version slows down superlinearly, so it is timed on a prefix (--legacy-size).
+    legacy_text = text[:legacy_size]
+    start = time.perf_counter()
+    legacy_result = legacy_encrypt(legacy_text, key)
+    baseline = time.perf_counter() - start
+    assert legacy_result == cipher.encrypt(legacy_text)
+
+    print(f"\nPlayfair, {size:,} bytes, key {key!r}")
+    report(f"lab playfair_encrypt ({len(legacy_text):,} bytes)", baseline, len(legacy_text))
+    baseline *= size / len(legacy_text)
+    report("PlayfairCipher (build + encrypt)", best_time(lambda: playfair.PlayfairCipher(key).encrypt(text), repeat=repeat), size, baseline)
+    report("PlayfairCipher.encrypt (digraph table)", best_time(cipher.encrypt, text, repeat=repeat), size, baseline)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=parse_size, default=parse_size("4M"), help="input size, e.g. 64K or 10M")
+    parser.add_argument("--playfair-size", type=parse_size, default=parse_size("10M"), help="input size for the Playfair comparison")
+    parser.add_argument("--legacy-size", type=parse_size, default=parse_size("1M"),
+                        help="prefix of the Playfair input given to the (quadratic) lab version")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    bench_caesar(args.size, repeat=args.repeat)
+    bench_selective(args.size, repeat=args.repeat)
+    bench_playfair(args.playfair_size, args.legacy_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Table-driven Caesar cipher.
+
+One ``str.maketrans`` table and one ``bytes.maketrans`` table is built per
+key (26 of each, at import time), so a whole string or buffer is shifted by a
+single ``translate`` call instead of a Python-level call per character.
+Only ASCII letters are shifted; everything else passes through unchanged.
+"""
+
+import string
+
+LOWER = string.ascii_lowercase
+UPPER = string.ascii_uppercase
+
+
+def _rotate(alphabet: str, key: int) -> str:
+    return alphabet[key:] + alphabet[:key]
+
+
+TEXT_TABLES = tuple(
+    str.maketrans(LOWER + UPPER, _rotate(LOWER, key) + _rotate(UPPER, key))
+    for key in range(26)
+)
+BYTE_TABLES = tuple(
+    bytes.maketrans((LOWER + UPPER).encode(), (_rotate(LOWER, key) + _rotate(UPPER, key)).encode())
+    for key in range(26)
+)
+
+
+def text_table(key: int) -> dict[int, int]:
+    return TEXT_TABLES[key % 26]
+
+
+def byte_table(key: int) -> bytes:
+    return BYTE_TABLES[key % 26]
+
+
+def encrypt_char(ch: str, key: int) -> str:
+    """Per-character reference implementation from the lab script."""
+    if ch.islower():
+        return chr((ord(ch) - ord('a') + key) % 26 + ord('a'))
+    elif ch.isupper():
+        return chr((ord(ch) - ord('A') + key) % 26 + ord('A'))
+    else:
+        return ch
+
+
+def decrypt_char(ch: str, key: int) -> str:
+    return encrypt_char(ch, -key)
+
+
+def encrypt_text(text: str, key: int) -> str:
+    return text.translate(TEXT_TABLES[key % 26])
+
+
+def decrypt_text(text: str, key: int) -> str:
+    return text.translate(TEXT_TABLES[-key % 26])
+
+
+def encrypt_bytes(data: bytes | bytearray | memoryview, key: int) -> bytes | bytearray:
+    """Shift the ASCII letters of a buffer; UTF-8 multi-byte sequences are left intact."""
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return data.translate(BYTE_TABLES[key % 26])
+
+
+def decrypt_bytes(data: bytes | bytearray | memoryview, key: int) -> bytes | bytearray:
+    return encrypt_bytes(data, -key)
@@ -0,0 +1,68 @@
+"""Recover unknown Caesar keys by letter-frequency analysis.
+
+Every ciphertext is reduced to one 26-bin letter histogram with a single
+``bincount`` over its bytes.  Decrypting with key ``k`` (``decrypt_char``
+semantics, case-insensitive) only relabels the bins, so all 26 candidate keys
+are scored by indexing the histogram instead of decrypting the text 26 times,
+and a batch of texts is scored as one ``(n, 26, 26)`` array operation.
+"""
+
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from .caesar import decrypt_text
+
+# Relative letter frequencies of English text, a-z.
+ENGLISH = np.array([
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+])
+ENGLISH /= ENGLISH.sum()
+
+# SHIFTS[k, i] is the ciphertext letter that decrypts to letter i under key k.
+SHIFTS = (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26
+
+
+def letter_counts(text: str | bytes) -> np.ndarray:
+    data = text.encode("utf-8") if isinstance(text, str) else text
+    counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    return counts[65:91] + counts[97:123]
+
+
+def chi_squared(counts: np.ndarray) -> np.ndarray:
+    """Score histograms of shape ``(..., 26)``; returns ``(..., 26)`` indexed by key, lower is better."""
+    counts = np.asarray(counts, dtype=np.float64)
+    expected = counts.sum(axis=-1, keepdims=True)[..., None] * ENGLISH
+    observed = counts[..., SHIFTS]
+    return np.divide((observed - expected) ** 2, expected, out=np.zeros_like(observed), where=expected > 0).sum(axis=-1)
+
+
+def rank_keys(text: str | bytes) -> list[tuple[int, float]]:
+    """Return all 26 keys as ``(key, chi2)`` pairs, most likely first."""
+    scores = chi_squared(letter_counts(text))
+    return [(int(key), float(scores[key])) for key in np.argsort(scores, kind="stable")]
+
+
+def rank_many(texts: Iterable[str | bytes]) -> tuple[np.ndarray, np.ndarray]:
+    """Rank keys for a batch of texts.
+
+    Returns ``(keys, scores)``, both of shape ``(n, 26)``, where row ``j`` of
+    ``keys`` lists the keys for text ``j`` from most to least likely.
+    """
+    counts = np.array([letter_counts(text) for text in texts], dtype=np.int64).reshape(-1, 26)
+    scores = chi_squared(counts)
+    keys = np.argsort(scores, axis=1, kind="stable")
+    return keys, np.take_along_axis(scores, keys, axis=1)
+
+
+def crack(text: str) -> tuple[int, str]:
+    key = rank_keys(text)[0][0]
+    return key, decrypt_text(text, key)
+
+
+def crack_many(texts: Iterable[str]) -> Iterator[tuple[int, str]]:
+    texts = list(texts)
+    keys, _ = rank_many(texts)
+    for text, key in zip(texts, keys[:, 0]):
+        yield int(key), decrypt_text(text, int(key))
@@ -0,0 +1,197 @@
+"""Command line interface: ``python -m cipher <command> ...``.
+
+Run from the "Information Security" directory (or with it on ``PYTHONPATH``)::
+
+    python -m cipher encrypt --algo playfair --key MONARCHY < in.txt > out.txt
+    python -m cipher decrypt --algo pipeline --key caesar:3,railfence:4 < out.txt
+
+Algorithm modules are imported inside the command handlers, only for the
+algorithm that was asked for, so that shell pipelines calling the CLI many
+times pay for little more than the interpreter start-up.
+"""
+
+import argparse
+import importlib
+import sys
+from contextlib import ExitStack
+from typing import BinaryIO
+
+
+def parse_size(text: str) -> int:
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper()
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def open_input(stack: ExitStack, path: str) -> BinaryIO:
+    if path == "-":
+        return sys.stdin.buffer
+    return stack.enter_context(open(path, "rb", buffering=0))
+
+
+def open_output(stack: ExitStack, path: str) -> BinaryIO:
+    if path == "-":
+        return sys.stdout.buffer
+    return stack.enter_context(open(path, "wb"))
+
+
+# algo -> (module, encrypt function, decrypt function, key type); imported on first use.
+ALGORITHMS = {
+    "caesar": (".caesar", "encrypt_text", "decrypt_text", int),
+    "playfair": (".playfair", "playfair_encrypt", "playfair_decrypt", str),
+    "railfence": (".railfence", "encrypt_rail_fence", "decrypt_rail_fence", int),
+    "columnar": (".columnar", "encrypt_columnar", "decrypt_columnar", str),
+    "pipeline": (".pipeline", "", "", str),
+}
+
+
+def cmd_transform(args: argparse.Namespace) -> int:
+    decrypt = args.command == "decrypt"
+    module_name, encrypt_name, decrypt_name, key_type = ALGORITHMS[args.algo]
+    try:
+        key = key_type(args.key)
+    except ValueError:
+        print(f"cipher: {args.algo} needs an integer key, got {args.key!r}", file=sys.stderr)
+        return 2
+    with ExitStack() as stack:
+        src = open_input(stack, args.input)
+        dst = open_output(stack, args.output)
+        if args.algo == "caesar":
+            # Position independent: stream it through the byte tables in constant memory.
+            from .caesar import byte_table
+            from .stream import translate_stream
+
+            translate_stream(src, dst, byte_table(-key if decrypt else key), args.chunk_size)
+            return 0
+
+        text = src.read().decode("utf-8")
+        # Keep a trailing newline (e.g. from echo) where it was instead of transposing it.
+        newline = text.endswith("\n")
+        if newline:
+            text = text[:-1]
+        module = importlib.import_module(module_name, __package__)
+        try:
+            if args.algo == "pipeline":
+                pipeline = module.Pipeline.from_spec(key)
+                result = pipeline.decrypt(text) if decrypt else pipeline.encrypt(text)
+                if args.verbose:
+                    print(pipeline.report(), file=sys.stderr)
+            else:
+                result = getattr(module, decrypt_name if decrypt else encrypt_name)(text, key)
+        except ValueError as err:
+            print(f"cipher: {err}", file=sys.stderr)
+            return 2
+        dst.write((result + "\n" * newline).encode("utf-8"))
+    return 0
+
+
+def cmd_stream(args: argparse.Namespace) -> int:
+    from .stream import decrypt_stream, encrypt_stream
+
+    transform = decrypt_stream if args.decrypt else encrypt_stream
+    with ExitStack() as stack:
+        src = open_input(stack, args.input)
+        dst = open_output(stack, args.output)
+        stats = transform(src, dst, args.key, args.chunk_size)
+    if not args.quiet:
+        print(f"{'Decrypted' if args.decrypt else 'Encrypted'} {stats}", file=sys.stderr)
+    return 0
+
+
+def cmd_batch(args: argparse.Namespace) -> int:
+    from .batch import process_batch
+
+    try:
+        report = process_batch(args.sources, args.output_dir, args.algo, args.key, args.decrypt,
+                               args.workers, args.chunk_size, args.suffix)
+    except (OSError, ValueError) as err:
+        print(f"cipher: {err}", file=sys.stderr)
+        return 2
+    if not args.quiet or report.failed:
+        print(f"{'Decrypted' if args.decrypt else 'Encrypted'} {report}", file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+def cmd_crack(args: argparse.Namespace) -> int:
+    with ExitStack() as stack:
+        text = open_input(stack, args.input).read().decode("utf-8")
+    if args.algo == "railfence":
+        from .railfence_crack import crack_rail_fence
+
+        texts = text.splitlines() if args.batch else [text.rstrip("\n")]
+        ranked = crack_rail_fence(texts, args.max_rails, args.threshold, args.workers)
+        for candidates in ranked:
+            if args.batch:
+                best = candidates[0] if candidates else None
+                print(f"{best.rails}\t{best.plaintext}" if best else "\t")
+                continue
+            for rank, candidate in enumerate(candidates[:args.top], 1):
+                print(f"{rank}) rails {candidate.rails:3d}  confidence {candidate.confidence:.2f}  {candidate.plaintext[:60]}")
+        return 0
+
+    from .caesar_crack import crack_many, rank_keys
+
+    if args.batch:
+        lines = text.splitlines()
+        for key, plain in crack_many(lines):
+            print(f"{key}\t{plain}")
+        return 0
+    for rank, (key, score) in enumerate(rank_keys(text)[:args.top], 1):
+        print(f"{rank}) key {key:2d}  chi2 {score:12.2f}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cipher", description="Classical ciphers from the Information Security labs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("encrypt", "decrypt"):
+        transform = commands.add_parser(name, help=f"{name} stdin (or a file) with one algorithm or a pipeline")
+        transform.add_argument("-a", "--algo", choices=ALGORITHMS, required=True)
+        transform.add_argument("-k", "--key", required=True,
+                               help="cipher key; for --algo pipeline a spec like caesar:3,playfair:KEY,railfence:3")
+        transform.add_argument("-i", "--input", default="-", help="input file (default: stdin)")
+        transform.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+        transform.add_argument("--chunk-size", type=parse_size, default=parse_size("1M"), help="caesar: block size")
+        transform.add_argument("-v", "--verbose", action="store_true", help="pipeline: report per-stage timings on stderr")
+        transform.set_defaults(func=cmd_transform)
+
+    stream = commands.add_parser("stream", help="Caesar-encrypt a file or stdin in fixed-size blocks")
+    stream.add_argument("-k", "--key", type=int, required=True)
+    stream.add_argument("-d", "--decrypt", action="store_true")
+    stream.add_argument("-i", "--input", default="-", help="input file (default: stdin)")
+    stream.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    stream.add_argument("--chunk-size", type=parse_size, default=parse_size("1M"), help="block size, e.g. 64K or 4M")
+    stream.add_argument("-q", "--quiet", action="store_true", help="do not report throughput on stderr")
+    stream.set_defaults(func=cmd_stream)
+
+    batch = commands.add_parser("batch", help="encrypt many files in parallel into an output directory")
+    batch.add_argument("sources", nargs="+", help="files, directories (recursive) or glob patterns like 'logs/**/*.txt'")
+    batch.add_argument("-o", "--output-dir", required=True, help="where to write the results (may be the source directory)")
+    batch.add_argument("-a", "--algo", choices=("caesar", "playfair", "railfence", "columnar"), required=True)
+    batch.add_argument("-k", "--key", required=True)
+    batch.add_argument("-d", "--decrypt", action="store_true")
+    batch.add_argument("--suffix", default="", help="append to every output name, e.g. .enc")
+    batch.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    batch.add_argument("--chunk-size", type=parse_size, default=parse_size("4M"),
+                       help="caesar: split larger files into chunks of this size")
+    batch.add_argument("-q", "--quiet", action="store_true", help="do not report throughput on stderr")
+    batch.set_defaults(func=cmd_batch)
+
+    crack = commands.add_parser("crack", help="rank candidate keys for a ciphertext with an unknown key")
+    crack.add_argument("--algo", choices=("caesar", "railfence"), default="caesar")
+    crack.add_argument("-i", "--input", default="-", help="input file (default: stdin)")
+    crack.add_argument("--top", type=int, default=3, help="number of keys to show")
+    crack.add_argument("--batch", action="store_true", help="crack every line separately, printing key<TAB>plaintext")
+    crack.add_argument("--max-rails", type=int, help="railfence: largest rail count to try (default: length - 1, at most 100)")
+    crack.add_argument("--threshold", type=float, default=0.8, help="railfence: stop once every text has a candidate this confident")
+    crack.add_argument("--workers", type=int, help="railfence: worker processes (default: CPU count, 1 = no pool)")
+    crack.set_defaults(func=cmd_crack)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,165 @@
+"""Columnar transposition with a precomputed column order.
+
+:class:`ColumnarCipher` sorts the key once; every column of the message
+grid is then one extended slice ``padded[idx::key_len]``, so no matrix is
+built and nothing is printed.  ``encrypt`` matches ``encrypt_columnar`` from
+the Lab 4 script (spaces removed, uppercased, padded with X, columns read in
+key order).  ``pad=None`` gives the irregular variant, whose short columns
+make the transposition exactly invertible without padding.  The same
+slicing works on ``bytes`` for binary data.
+
+:class:`RotatedColumnarCipher` is a reproducible version of
+"column Modify.py": the key rotation is an explicit parameter (defaulting to
+the script's ``datetime.now().second``) stored in a small ciphertext header,
+and the message is transposed in independent fixed-size blocks.  Each
+ciphertext block covers exactly the same byte range as its plaintext block,
+so blocks can be encrypted in parallel and any single block can be
+decrypted on its own.
+"""
+
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import repeat
+from typing import Callable
+
+HEADER = struct.Struct("<4sHIQ")
+MAGIC = b"RCT1"
+
+
+class ColumnarCipher:
+    def __init__(self, key: str, pad: str | None = "X") -> None:
+        if not key:
+            raise ValueError("the key must not be empty")
+        self.key = key
+        self.pad = pad
+        # Stable sort, so repeated key characters keep their left-to-right order.
+        self.order = sorted(range(len(key)), key=key.__getitem__)
+
+    def _transpose(self, data: str | bytes, pad: str | bytes | None, empty: str | bytes) -> str | bytes:
+        width = len(self.order)
+        if pad is not None:
+            data += pad * (-len(data) % width)
+        return empty.join([data[idx::width] for idx in self.order])
+
+    def _untranspose(self, data: str | bytes, out: list[str] | bytearray) -> list[str] | bytearray:
+        width = len(self.order)
+        rows, extra = divmod(len(data), width)
+        start = 0
+        for idx in self.order:
+            stop = start + rows + (idx < extra)
+            out[idx::width] = data[start:stop]
+            start = stop
+        return out
+
+    def encrypt(self, message: str) -> str:
+        return self.encrypt_raw(message.replace(" ", "").upper())
+
+    def encrypt_raw(self, text: str) -> str:
+        """Transpose text as is, without removing spaces or changing case."""
+        return self._transpose(text, self.pad, "")
+
+    def decrypt(self, ciphertext: str) -> str:
+        """Undo the transposition; padding added by ``encrypt`` is left in place."""
+        return "".join(self._untranspose(ciphertext, [""] * len(ciphertext)))
+
+    def encrypt_bytes(self, data: bytes | bytearray | memoryview) -> bytes:
+        pad = None if self.pad is None else self.pad.encode()
+        return self._transpose(bytes(data), pad, b"")
+
+    def decrypt_bytes(self, data: bytes | bytearray | memoryview) -> bytes:
+        data = bytes(data)
+        return bytes(self._untranspose(data, bytearray(len(data))))
+
+
+def encrypt_columnar(message: str, key: str) -> str:
+    return ColumnarCipher(key).encrypt(message)
+
+
+def decrypt_columnar(ciphertext: str, key: str) -> str:
+    return ColumnarCipher(key).decrypt(ciphertext)
+
+
+def rotate_key(key: str, rotation: int) -> str:
+    rotation %= len(key)
+    return key[rotation:] + key[:rotation]
+
+
+def _encrypt_block(key: str, block: bytes) -> bytes:
+    return ColumnarCipher(key, pad=None).encrypt_bytes(block)
+
+
+def _decrypt_block(key: str, block: bytes) -> bytes:
+    return ColumnarCipher(key, pad=None).decrypt_bytes(block)
+
+
+class RotatedColumnarCipher:
+    """Block-wise columnar transposition under a rotated key.
+
+    Ciphertext layout: ``HEADER`` (magic, rotation, block size, message
+    length) followed by the transposed blocks.  ``block_size`` is rounded up
+    to a multiple of the key length; the last block may be shorter and uses
+    the irregular (unpadded) transposition.
+    """
+
+    def __init__(self, base_key: str, block_size: int = 1 << 16) -> None:
+        if not base_key:
+            raise ValueError("the key must not be empty")
+        if len(base_key) > 0xFFFF:
+            raise ValueError("the key must be shorter than 65536 characters")
+        self.base_key = base_key
+        self.block_size = -(-block_size // len(base_key)) * len(base_key)
+        # Checked after rounding: the header stores the rounded size as a 32-bit field.
+        if not 1 <= self.block_size <= 0xFFFFFFFF:
+            raise ValueError(f"the block size must be between 1 and {0xFFFFFFFF} once rounded to the key length,"
+                             f" got {self.block_size}")
+
+    def _map(self, func: Callable[[str, bytes], bytes], key: str, blocks: list[bytes], workers: int) -> list[bytes]:
+        if workers <= 1 or len(blocks) <= 1:
+            return list(map(func, repeat(key), blocks))
+        with ProcessPoolExecutor(workers) as pool:
+            return list(pool.map(func, repeat(key), blocks, chunksize=max(1, len(blocks) // (workers * 4))))
+
+    def encrypt(self, data: bytes | bytearray | memoryview | str, rotation: int | None = None,
+                workers: int = 1) -> bytes:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        data = bytes(data)
+        if rotation is None:
+            rotation = datetime.now().second
+        rotation %= len(self.base_key)
+        size = self.block_size
+        blocks = [data[i:i + size] for i in range(0, len(data), size)]
+        header = HEADER.pack(MAGIC, rotation, size, len(data))
+        return header + b"".join(self._map(_encrypt_block, rotate_key(self.base_key, rotation), blocks, workers))
+
+    @staticmethod
+    def read_header(data: bytes | bytearray | memoryview) -> tuple[int, int, int]:
+        """Return ``(rotation, block_size, length)`` from a ciphertext."""
+        if len(data) < HEADER.size:
+            raise ValueError("ciphertext is too short")
+        magic, rotation, block_size, length = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a rotated columnar ciphertext")
+        if len(data) - HEADER.size != length:
+            raise ValueError("ciphertext length does not match its header")
+        return rotation, block_size, length
+
+    def decrypt(self, data: bytes | bytearray | memoryview, workers: int = 1) -> bytes:
+        rotation, size, length = self.read_header(data)
+        body = bytes(data[HEADER.size:])
+        blocks = [body[i:i + size] for i in range(0, length, size)]
+        return b"".join(self._map(_decrypt_block, rotate_key(self.base_key, rotation), blocks, workers))
+
+    def block_count(self, data: bytes | bytearray | memoryview) -> int:
+        _, size, length = self.read_header(data)
+        return -(-length // size)
+
+    def decrypt_block(self, data: bytes | bytearray | memoryview, index: int) -> bytes:
+        """Decrypt only block ``index``; it holds plaintext bytes ``index * block_size`` onwards."""
+        rotation, size, length = self.read_header(data)
+        if not 0 <= index < -(-length // size):
+            raise IndexError("block index out of range")
+        start = HEADER.size + index * size
+        block = bytes(data[start:min(start + size, HEADER.size + length)])
+        return _decrypt_block(rotate_key(self.base_key, rotation), block)
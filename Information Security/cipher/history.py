@@ -0,0 +1,381 @@
+"""Append-only binary history of cipher operations.
+
+Replaces the plain-text ``cipher_history.log``.  Two files are kept open for
+the lifetime of the store:
+
+* ``<path>.dat`` holds the records: a fixed 21-byte header (timestamp, action
+  code, key, input length, output length) followed by the UTF-8 input and
+  output text.  Keys are stored as entered, as 32-bit signed integers; a key
+  outside that range is rejected rather than altered.
+* ``<path>.idx`` holds one fixed 17-byte entry per record (data offset,
+  timestamp, action code), so "last N", "by action", "time range" and page
+  lookups seek straight to the records they need instead of reading the
+  whole history.
+
+Writes go through buffered handles and are fsync'ed every ``sync_every``
+records (and on :meth:`HistoryStore.close`).  Records whose index entry was
+lost in a crash are re-indexed, and torn records are dropped, when the store
+is reopened.
+
+:class:`AsyncHistoryWriter` moves the appends off the caller's thread: a
+cipher operation only enqueues its record and a background thread writes
+the queue out in batches.
+"""
+
+import bisect
+import operator
+import os
+import queue
+import re
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator
+
+ACTIONS = ("Manual Encrypt", "Random Encrypt", "Selective Encrypt", "Decrypt")
+
+RECORD = struct.Struct("<dBiII")
+INDEX = struct.Struct("<QdB")
+LEGACY_LINE = re.compile(r"^(.*?) \| (.*?) \| Key: (-?\d+) \| Input: (.*) \| Output: (.*)$")
+
+
+@dataclass
+class HistoryEntry:
+    timestamp: float
+    action: str
+    key: int
+    input_text: str
+    output_text: str
+
+    def __str__(self) -> str:
+        return (f"{datetime.fromtimestamp(self.timestamp)} | {self.action} | Key: {self.key} "
+                f"| Input: {self.input_text} | Output: {self.output_text}")
+
+
+def _check_key(key: int) -> int:
+    key = operator.index(key)
+    if not -2**31 <= key < 2**31:
+        raise ValueError(f"key {key} is out of range for the history record (32-bit signed)")
+    return key
+
+
+class _Timestamps:
+    """Sequence view of the index timestamps for ``bisect``."""
+
+    def __init__(self, store: "HistoryStore") -> None:
+        self.store = store
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __getitem__(self, i: int) -> float:
+        return self.store._index_entry(i)[1]
+
+
+class HistoryStore:
+    def __init__(self, path: str = "cipher_history", sync_every: int = 32) -> None:
+        self.data_path = path + ".dat"
+        self.index_path = path + ".idx"
+        self.sync_every = sync_every
+        self._unsynced = 0
+        for name in (self.data_path, self.index_path):
+            open(name, "ab").close()
+        self._recover()
+        self._data = open(self.data_path, "ab", buffering=1 << 16)
+        self._index = open(self.index_path, "ab", buffering=1 << 16)
+        self._data_reader = open(self.data_path, "rb")
+        self._index_reader = open(self.index_path, "rb")
+        self._count = os.path.getsize(self.index_path) // INDEX.size
+        self._offset = os.path.getsize(self.data_path)
+        self._last_timestamp = self._index_entry(self._count - 1)[1] if self._count else 0.0
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _recover(self) -> None:
+        data_size = os.path.getsize(self.data_path)
+        with open(self.index_path, "r+b") as index, open(self.data_path, "r+b") as data:
+            count = os.path.getsize(self.index_path) // INDEX.size
+            end = 0
+            # Drop index entries that point at records missing from the data file.
+            while count:
+                index.seek((count - 1) * INDEX.size)
+                offset = INDEX.unpack(index.read(INDEX.size))[0]
+                data.seek(offset)
+                header = data.read(RECORD.size)
+                if len(header) == RECORD.size:
+                    _, _, _, in_len, out_len = RECORD.unpack(header)
+                    end = offset + RECORD.size + in_len + out_len
+                    if end <= data_size:
+                        break
+                count -= 1
+                end = 0
+            index.truncate(count * INDEX.size)
+            index.seek(0, os.SEEK_END)
+            # Re-index complete records written after the last index entry.
+            data.seek(end)
+            while True:
+                header = data.read(RECORD.size)
+                if len(header) < RECORD.size:
+                    break
+                timestamp, action, _, in_len, out_len = RECORD.unpack(header)
+                if end + RECORD.size + in_len + out_len > data_size:
+                    break
+                index.write(INDEX.pack(end, timestamp, action))
+                end += RECORD.size + in_len + out_len
+                data.seek(end)
+            data.truncate(end)
+
+    def append(self, action: str, key: int, input_text: str, output_text: str,
+               timestamp: float | None = None) -> None:
+        """Add a record stamped ``timestamp`` (default: now).
+
+        The index is kept sorted by time: an explicit ``timestamp`` older
+        than the last record raises ValueError, while the current time is
+        raised to the last record's if the clock stepped backwards.
+        """
+        self._append(action, key, input_text, output_text, timestamp, clock=timestamp is None)
+
+    def _append(self, action: str, key: int, input_text: str, output_text: str,
+                timestamp: float | None, clock: bool) -> None:
+        try:
+            code = ACTIONS.index(action)
+        except ValueError:
+            raise ValueError(f"Unknown action {action!r}") from None
+        key = _check_key(key)
+        if timestamp is None:
+            timestamp = time.time()
+        if timestamp < self._last_timestamp:
+            if not clock:
+                raise ValueError(f"timestamp {datetime.fromtimestamp(timestamp)} is older than the last record "
+                                 f"({datetime.fromtimestamp(self._last_timestamp)})")
+            timestamp = self._last_timestamp
+        input_bytes = input_text.encode("utf-8")
+        output_bytes = output_text.encode("utf-8")
+        self._data.write(RECORD.pack(timestamp, code, key, len(input_bytes), len(output_bytes)))
+        self._data.write(input_bytes)
+        self._data.write(output_bytes)
+        self._index.write(INDEX.pack(self._offset, timestamp, code))
+        self._offset += RECORD.size + len(input_bytes) + len(output_bytes)
+        self._count += 1
+        self._last_timestamp = timestamp
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def flush(self) -> None:
+        self._data.flush()
+        self._index.flush()
+
+    def sync(self) -> None:
+        self.flush()
+        os.fsync(self._data.fileno())
+        os.fsync(self._index.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        if self._data.closed:
+            return
+        self.sync()
+        for handle in (self._data, self._index, self._data_reader, self._index_reader):
+            handle.close()
+
+    def _index_entry(self, i: int) -> tuple[int, float, int]:
+        self._index.flush()
+        self._index_reader.seek(i * INDEX.size)
+        return INDEX.unpack(self._index_reader.read(INDEX.size))
+
+    def _read(self, offset: int) -> HistoryEntry:
+        self._data.flush()
+        self._data_reader.seek(offset)
+        timestamp, code, key, in_len, out_len = RECORD.unpack(self._data_reader.read(RECORD.size))
+        payload = self._data_reader.read(in_len + out_len)
+        return HistoryEntry(timestamp, ACTIONS[code], key,
+                            payload[:in_len].decode("utf-8"), payload[in_len:].decode("utf-8"))
+
+    def _index_range(self, start: int, stop: int) -> list[tuple[int, float, int]]:
+        if start >= stop:
+            return []
+        self._index.flush()
+        self._index_reader.seek(start * INDEX.size)
+        return list(INDEX.iter_unpack(self._index_reader.read((stop - start) * INDEX.size)))
+
+    def last(self, n: int) -> list[HistoryEntry]:
+        """The ``n`` most recent entries, newest first."""
+        return self.page(1, n)
+
+    def page(self, number: int, size: int = 10) -> list[HistoryEntry]:
+        """Page ``number`` (1-based) of the history, newest entries first."""
+        stop = max(self._count - (number - 1) * size, 0)
+        entries = self._index_range(max(stop - size, 0), stop)
+        return [self._read(offset) for offset, _, _ in reversed(entries)]
+
+    def pages(self, size: int = 10) -> int:
+        return -(-self._count // size)
+
+    def by_action(self, action: str, limit: int | None = None, block: int = 4096) -> Iterator[HistoryEntry]:
+        """Entries with the given action, newest first, found by scanning only the index."""
+        code = ACTIONS.index(action)
+        found = 0
+        stop = self._count
+        while stop > 0 and (limit is None or found < limit):
+            start = max(stop - block, 0)
+            for offset, _, entry_code in reversed(self._index_range(start, stop)):
+                if entry_code == code:
+                    yield self._read(offset)
+                    found += 1
+                    if limit is not None and found >= limit:
+                        return
+            stop = start
+
+    def between(self, start: datetime | float, end: datetime | float) -> Iterator[HistoryEntry]:
+        """Entries with ``start <= timestamp < end``, oldest first, located by binary search."""
+        if isinstance(start, datetime):
+            start = start.timestamp()
+        if isinstance(end, datetime):
+            end = end.timestamp()
+        timestamps = _Timestamps(self)
+        first = bisect.bisect_left(timestamps, start)
+        last = bisect.bisect_left(timestamps, end, lo=first)
+        for i in range(first, last, 4096):
+            for offset, _, _ in self._index_range(i, min(i + 4096, last)):
+                yield self._read(offset)
+
+    def import_log(self, path: str) -> int:
+        """Append the entries of an old text ``cipher_history.log``; returns how many were imported.
+
+        Lines that do not parse, or whose key does not fit the record, are skipped.
+        """
+        entries = []
+        with open(path, "r", encoding="utf-8") as log_file:
+            for line in log_file:
+                match = LEGACY_LINE.match(line.rstrip("\n"))
+                if not match or match[2] not in ACTIONS or not -2**31 <= int(match[3]) < 2**31:
+                    continue
+                timestamp = datetime.fromisoformat(match[1]).timestamp()
+                entries.append((timestamp, match[2], int(match[3]), match[4], match[5]))
+        # The old log was written in clock order, which may step backwards; the index needs time order.
+        entries.sort(key=lambda entry: entry[0])
+        if entries and entries[0][0] < self._last_timestamp:
+            raise ValueError(f"{path} has entries older than the last record of the history")
+        for timestamp, action, key, input_text, output_text in entries:
+            self.append(action, key, input_text, output_text, timestamp)
+        self.sync()
+        return len(entries)
+
+
+class AsyncHistoryWriter:
+    """Append history records from a background thread in batches.
+
+    :meth:`log` only puts the record on a bounded queue.  When the queue is
+    full the caller waits up to ``block_timeout`` seconds (counted in
+    ``backpressured``) and the record is dropped if there is still no room
+    (counted in ``dropped``).  The writer thread appends up to ``batch_size``
+    records at a time and flushes the store at least every
+    ``flush_interval`` seconds; a record the store cannot write is counted
+    in ``failed`` and skipped, so :meth:`flush` never waits on a dead thread.
+    """
+
+    _STOP = object()
+
+    def __init__(self, store: HistoryStore, batch_size: int = 64, flush_interval: float = 0.5,
+                 max_queue: int = 10_000, block_timeout: float = 0.1) -> None:
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.backpressured = 0
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def log(self, action: str, key: int, input_text: str, output_text: str) -> bool:
+        """Queue a record; returns False if it had to be dropped.
+
+        An unknown action or a key that does not fit the record raises
+        ValueError here, on the caller's thread.
+        """
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action {action!r}")
+        if self._closed:
+            raise RuntimeError("history writer is closed")
+        key = _check_key(key)
+        record = (action, key, input_text, output_text, time.time())
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.backpressured += 1
+        try:
+            self._queue.put(record, timeout=self.block_timeout)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def _run(self) -> None:
+        get = self._queue.get
+        while True:
+            try:
+                batch = [get(timeout=self.flush_interval)]
+            except queue.Empty:
+                self._flush_store()
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            try:
+                for record in batch:
+                    if record is self._STOP:
+                        stop = True
+                        continue
+                    try:
+                        # The timestamp was read from the clock in log(), so it may be clamped.
+                        self.store._append(*record, clock=True)
+                        self.written += 1
+                    except Exception:
+                        with self._lock:
+                            self.failed += 1
+                self._flush_store()
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _flush_store(self) -> None:
+        try:
+            self.store.flush()
+        except OSError:
+            pass  # the buffered records are written again on the next flush
+
+    def flush(self) -> None:
+        """Block until every queued record has been written to the store."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write out everything still queued, stop the thread and close the store."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self.store.close()
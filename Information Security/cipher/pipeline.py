@@ -0,0 +1,216 @@
+"""Product ciphers: several lab ciphers chained into one pipeline.
+
+A :class:`Pipeline` runs its stages in order to encrypt and runs their
+inverses in reverse order to decrypt, recording how long each stage took.
+Stages that can work chunk by chunk (Caesar, Playfair) are chained as
+generators by :meth:`Pipeline.encrypt_stream`, so nothing is joined until a
+whole-message stage (Rail Fence, Columnar) needs the full text; every other
+stage receives the previous stage's string directly.
+
+Notes on invertibility: Playfair keeps only letters, folds J into I and
+inserts X fillers, so its decryption returns that prepared text, not what it
+was given.  Decryption is therefore lossy from that stage on: a Caesar stage
+ahead of it shifts the prepared text back, so the usual Caesar -> Playfair
+-> Rail Fence -> Columnar chain decrypts to the uppercase letters of the
+plaintext with the fillers and folded letters shifted along with them.
+Playfair may not follow a stage that moves characters by position (Rail
+Fence, Columnar), because that stage would be handed text of a different
+length than it produced and would silently scramble it.  The Columnar stage
+uses the unpadded transposition so that the stages before it are handed back
+exactly what they produced.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from . import caesar, railfence
+from .columnar import ColumnarCipher
+from .playfair import key_cache
+
+
+class Stage(ABC):
+    name = "stage"
+    streamable = False
+    # Decryption returns a normalised form of the input rather than the input itself.
+    lossy = False
+    # Output positions depend on the length of the whole text (transpositions).
+    positional = False
+
+    @abstractmethod
+    def encrypt(self, text: str) -> str: ...
+
+    @abstractmethod
+    def decrypt(self, text: str) -> str: ...
+
+    def encrypt_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        yield self.encrypt("".join(chunks))
+
+    def decrypt_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        yield self.decrypt("".join(chunks))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class CaesarStage(Stage):
+    streamable = True
+
+    def __init__(self, key: int) -> None:
+        self.key = key
+        self.name = f"caesar:{key}"
+
+    def encrypt(self, text: str) -> str:
+        return caesar.encrypt_text(text, self.key)
+
+    def decrypt(self, text: str) -> str:
+        return caesar.decrypt_text(text, self.key)
+
+    def encrypt_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        table = caesar.text_table(self.key)
+        for chunk in chunks:
+            yield chunk.translate(table)
+
+    def decrypt_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        table = caesar.text_table(-self.key)
+        for chunk in chunks:
+            yield chunk.translate(table)
+
+
+class PlayfairStage(Stage):
+    streamable = True
+    lossy = True
+
+    def __init__(self, key: str) -> None:
+        self.cipher = key_cache.get(key)
+        self.name = f"playfair:{key}"
+
+    def encrypt(self, text: str) -> str:
+        return self.cipher.encrypt(text)
+
+    def decrypt(self, text: str) -> str:
+        return self.cipher.decrypt(text)
+
+    def encrypt_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        return self.cipher.encrypt_stream(chunks)
+
+    def decrypt_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        return self.cipher.decrypt_stream(chunks)
+
+
+class RailFenceStage(Stage):
+    positional = True
+
+    def __init__(self, rails: int) -> None:
+        self.rails = rails
+        self.name = f"railfence:{rails}"
+
+    def encrypt(self, text: str) -> str:
+        return railfence.encrypt_rail_fence(text, self.rails)
+
+    def decrypt(self, text: str) -> str:
+        return railfence.decrypt_rail_fence(text, self.rails)
+
+
+class ColumnarStage(Stage):
+    positional = True
+
+    def __init__(self, key: str) -> None:
+        self.cipher = ColumnarCipher(key, pad=None)
+        self.name = f"columnar:{key}"
+
+    def encrypt(self, text: str) -> str:
+        return self.cipher.encrypt_raw(text)
+
+    def decrypt(self, text: str) -> str:
+        return self.cipher.decrypt(text)
+
+
+STAGES = {"caesar": lambda key: CaesarStage(int(key)), "playfair": PlayfairStage,
+          "railfence": lambda key: RailFenceStage(int(key)), "columnar": ColumnarStage}
+
+
+def parse_stage(spec: str) -> Stage:
+    """Build a stage from ``"<algo>:<key>"``, e.g. ``"caesar:3"`` or ``"playfair:MONARCHY"``."""
+    algo, sep, key = spec.partition(":")
+    if not sep or algo.strip().lower() not in STAGES:
+        raise ValueError(f"bad stage {spec!r}; expected one of {', '.join(STAGES)} as <algo>:<key>")
+    return STAGES[algo.strip().lower()](key)
+
+
+@dataclass
+class StageTiming:
+    name: str
+    seconds: float
+    chars: int
+
+    def __str__(self) -> str:
+        rate = self.chars / self.seconds / 1e6 if self.seconds else float("inf")
+        return f"{self.name:<24} {self.seconds * 1000:10.2f} ms  {self.chars:>12,} chars  {rate:10.2f} M chars/s"
+
+
+class Pipeline:
+    def __init__(self, stages: Iterable[Stage]) -> None:
+        self.stages = list(stages)
+        for i, stage in enumerate(self.stages):
+            before = next((earlier for earlier in self.stages[:i] if earlier.positional), None)
+            if stage.lossy and before is not None:
+                raise ValueError(f"{stage.name} cannot follow {before.name}: its decryption changes the text "
+                                 f"length, which {before.name} cannot invert")
+        self.timings: list[StageTiming] = []
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "Pipeline":
+        """``"caesar:3,playfair:MONARCHY,railfence:3,columnar:ZEBRAS"``"""
+        return cls(parse_stage(part) for part in spec.split(",") if part.strip())
+
+    def _run(self, stages: list[Stage], text: str, decrypt: bool) -> str:
+        self.timings = []
+        for stage in stages:
+            start = time.perf_counter()
+            text = stage.decrypt(text) if decrypt else stage.encrypt(text)
+            self.timings.append(StageTiming(stage.name, time.perf_counter() - start, len(text)))
+        return text
+
+    def encrypt(self, text: str) -> str:
+        return self._run(self.stages, text, decrypt=False)
+
+    def decrypt(self, text: str) -> str:
+        return self._run(self.stages[::-1], text, decrypt=True)
+
+    def _run_stream(self, stages: list[Stage], chunks: Iterable[str], decrypt: bool) -> Iterator[str]:
+        # Each stage pulls from the one before it, so the time measured around a
+        # stage's next() includes its upstream; subtracting gives its own share.
+        inclusive = [0.0] * len(stages)
+        produced = [0] * len(stages)
+
+        def timed(iterator: Iterator[str], slot: int) -> Iterator[str]:
+            clock = time.perf_counter
+            while True:
+                start = clock()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    inclusive[slot] += clock() - start
+                    return
+                inclusive[slot] += clock() - start
+                produced[slot] += len(item)
+                yield item
+
+        stream: Iterator[str] = iter(chunks)
+        for slot, stage in enumerate(stages):
+            step = stage.decrypt_stream(stream) if decrypt else stage.encrypt_stream(stream)
+            stream = timed(iter(step), slot)
+        yield from stream
+        self.timings = [StageTiming(stage.name, inclusive[i] - (inclusive[i - 1] if i else 0.0), produced[i])
+                        for i, stage in enumerate(stages)]
+
+    def encrypt_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        return self._run_stream(self.stages, chunks, decrypt=False)
+
+    def decrypt_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        return self._run_stream(self.stages[::-1], chunks, decrypt=True)
+
+    def report(self) -> str:
+        return "\n".join(map(str, self.timings))
@@ -0,0 +1,220 @@
+"""Table-driven 5x5 Playfair cipher.
+
+:class:`PlayfairCipher` builds the key square once, a letter -> (row, col)
+map, and the full 25x25 digraph -> digraph table for each direction, so
+encrypting a prepared message is one dictionary lookup per pair.  The rules
+(J folded into I, only letters kept, X between doubled letters and as
+padding, right/down shift to encrypt) match ``playfair_encrypt`` and
+``playfair_decrypt`` in the Lab 2 script.
+
+Compiled keys are kept in an LRU :class:`KeyCache`, so ``playfair_encrypt``
+and ``playfair_decrypt`` only build the square and tables the first time a
+key is seen.  Unlike the lab script they print the square only when asked to
+(``verbose=True``).
+
+:meth:`PlayfairCipher.encrypt_stream` and :meth:`PlayfairCipher.decrypt_stream`
+work on an iterable of text chunks (e.g. ``iter(partial(f.read, 1 << 20), "")``)
+and yield ciphertext per chunk, so arbitrarily large inputs are processed in
+constant memory.
+"""
+
+import threading
+from collections import OrderedDict
+from operator import add
+from typing import Iterable, Iterator, NamedTuple
+
+ALPHABET = "ABCDEFGHIKLMNOPQRSTUVWXYZ"
+_LETTERS = frozenset(ALPHABET)
+# Lowercase is folded to uppercase and J to I; every other character is dropped.
+_FOLD = {**{ord(ch): ch for ch in ALPHABET}, **{ord(ch.lower()): ch for ch in ALPHABET},
+         ord("J"): "I", ord("j"): "I"}
+_KEEP = str.maketrans({**{i: None for i in range(128)}, **_FOLD})
+
+
+def clean(text: str) -> str:
+    """Uppercase, fold J into I and drop everything that is not a letter."""
+    text = text.translate(_KEEP)
+    if not text.isascii():
+        text = "".join(ch for ch in text if ch in _LETTERS)
+    return text
+
+
+def generate_matrix(key: str) -> list[list[str]]:
+    letters = dict.fromkeys(clean(key) + ALPHABET)
+    square = "".join(letters)
+    return [list(square[i:i + 5]) for i in range(0, 25, 5)]
+
+
+def print_matrix(matrix: list[list[str]]) -> None:
+    print("\nGenerated 5x5 Playfair Matrix:")
+    for row in matrix:
+        print(" ".join(row))
+    print()
+
+
+def _pair_up(text: str, pending: str = "") -> tuple[list[str], str]:
+    """Split cleaned text into digraphs, continuing from a letter left over by the previous chunk.
+
+    Returns the digraphs and the letter still waiting for a partner ("" if none).
+    """
+    if pending:
+        text = pending + text
+    pairs = []
+    i, n = 0, len(text)
+    while i < n - 1:
+        a, b = text[i], text[i + 1]
+        if a == b:
+            pairs.append(a + "X")
+            i += 1
+        else:
+            pairs.append(a + b)
+            i += 2
+    return pairs, text[i:]
+
+
+def iter_digraphs(chunks: Iterable[str]) -> Iterator[str]:
+    """Lazily yield the prepared digraphs of text arriving in chunks.
+
+    The result is the same as pairing up ``process_text("".join(chunks))``:
+    J is folded into I per chunk, and a letter left over at the end of one
+    chunk is paired (or split from its double with X) at the start of the next.
+    """
+    pending = ""
+    for chunk in chunks:
+        pairs, pending = _pair_up(clean(chunk), pending)
+        yield from pairs
+    if pending:
+        yield pending + "X"
+
+
+def process_text(text: str) -> str:
+    """Prepare plaintext: split doubled letters with X and pad to an even length."""
+    pairs, pending = _pair_up(clean(text))
+    if pending:
+        pairs.append(pending + "X")
+    return "".join(pairs)
+
+
+class PlayfairCipher:
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self.matrix = generate_matrix(key)
+        self.positions = {ch: (r, c) for r, row in enumerate(self.matrix) for c, ch in enumerate(row)}
+        self.encrypt_table = self._digraph_table(1)
+        self.decrypt_table = self._digraph_table(-1)
+
+    def _digraph_table(self, shift: int) -> dict[str, str]:
+        m = self.matrix
+        table = {}
+        for a, (r1, c1) in self.positions.items():
+            for b, (r2, c2) in self.positions.items():
+                if r1 == r2:
+                    table[a + b] = m[r1][(c1 + shift) % 5] + m[r2][(c2 + shift) % 5]
+                elif c1 == c2:
+                    table[a + b] = m[(r1 + shift) % 5][c1] + m[(r2 + shift) % 5][c2]
+                else:
+                    table[a + b] = m[r1][c2] + m[r2][c1]
+        return table
+
+    def encrypt_prepared(self, text: str) -> str:
+        """Encrypt text that is already prepared (letters only, even length)."""
+        return "".join(map(self.encrypt_table.__getitem__, map(add, text[0::2], text[1::2])))
+
+    def encrypt(self, plaintext: str) -> str:
+        return self.encrypt_prepared(process_text(plaintext))
+
+    def encrypt_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        lookup = self.encrypt_table.__getitem__
+        pending = ""
+        for chunk in chunks:
+            pairs, pending = _pair_up(clean(chunk), pending)
+            if pairs:
+                yield "".join(map(lookup, pairs))
+        if pending:
+            yield lookup(pending + "X")
+
+    def decrypt_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        lookup = self.decrypt_table.__getitem__
+        pending = ""
+        for chunk in chunks:
+            text = pending + clean(chunk)
+            cut = len(text) - len(text) % 2
+            pending = text[cut:]
+            if cut:
+                yield "".join(map(lookup, map(add, text[0:cut:2], text[1:cut:2])))
+        if pending:
+            raise ValueError("Playfair ciphertext must have an even number of letters")
+
+    def decrypt(self, ciphertext: str) -> str:
+        ciphertext = clean(ciphertext)
+        if len(ciphertext) % 2:
+            raise ValueError("Playfair ciphertext must have an even number of letters")
+        return "".join(map(self.decrypt_table.__getitem__, map(add, ciphertext[0::2], ciphertext[1::2])))
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class KeyCache:
+    """Least-recently-used cache of compiled :class:`PlayfairCipher` objects.
+
+    Keys that produce the same square (e.g. ``"key"`` and ``"KEY!"``) share
+    one entry.  ``maxsize=0`` disables caching.
+    """
+
+    def __init__(self, maxsize: int = 32) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize must be >= 0")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, PlayfairCipher] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> PlayfairCipher:
+        square = "".join(dict.fromkeys(clean(key)))
+        with self._lock:
+            cipher = self._entries.get(square)
+            if cipher is not None:
+                self._entries.move_to_end(square)
+                self.hits += 1
+                return cipher
+            self.misses += 1
+        cipher = PlayfairCipher(key)
+        if self.maxsize:
+            with self._lock:
+                self._entries[square] = cipher
+                self._entries.move_to_end(square)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return cipher
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+key_cache = KeyCache()
+
+
+def playfair_encrypt(plaintext: str, key: str, cache: KeyCache | None = None, verbose: bool = False) -> str:
+    cipher = (key_cache if cache is None else cache).get(key)
+    if verbose:
+        print_matrix(cipher.matrix)
+    return cipher.encrypt(plaintext)
+
+
+def playfair_decrypt(ciphertext: str, key: str, cache: KeyCache | None = None, verbose: bool = False) -> str:
+    cipher = (key_cache if cache is None else cache).get(key)
+    if verbose:
+        print_matrix(cipher.matrix)
+    return cipher.decrypt(ciphertext)
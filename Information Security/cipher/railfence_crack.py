@@ -0,0 +1,184 @@
+"""Recover unknown Rail Fence keys by trying every rail count.
+
+Each candidate rail count is decrypted with the inverse permutation from
+:mod:`cipher.railfence` (``decrypt_rail_fence`` semantics) and scored with a
+letter-bigram language model.  Candidates are spread over a process pool;
+ciphertexts of the same length are decrypted together so each rail count's
+permutation is built once for the whole batch and dropped afterwards, and
+the search for a batch stops as soon as every ciphertext in it has a
+candidate above the confidence threshold.  At most ``2 * workers`` rail
+counts are in flight at a time, so an early stop wastes little work, and
+unless ``max_rails`` says otherwise only up to ``DEFAULT_MAX_RAILS`` rails
+are tried.
+"""
+
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from operator import add
+from itertools import islice
+from typing import Sequence, overload
+
+from .railfence import inverse_order
+
+DEFAULT_MAX_RAILS = 100
+
+# Frequencies (percent) of the most common English letter pairs.
+COMMON_BIGRAMS = {
+    "TH": 3.56, "HE": 3.07, "IN": 2.43, "ER": 2.05, "AN": 1.99, "RE": 1.85, "ON": 1.76, "AT": 1.49,
+    "EN": 1.45, "ND": 1.35, "TI": 1.34, "ES": 1.34, "OR": 1.28, "TE": 1.20, "OF": 1.17, "ED": 1.17,
+    "IS": 1.13, "IT": 1.12, "AL": 1.09, "AR": 1.07, "ST": 1.05, "TO": 1.04, "NT": 1.04, "NG": 0.95,
+    "SE": 0.93, "HA": 0.93, "AS": 0.87, "OU": 0.87, "IO": 0.83, "LE": 0.83, "VE": 0.83, "CO": 0.79,
+    "ME": 0.79, "DE": 0.76, "HI": 0.76, "RI": 0.73, "RO": 0.73, "IC": 0.70, "NE": 0.69, "EA": 0.69,
+    "RA": 0.69, "CE": 0.65, "LI": 0.62, "CH": 0.60, "LL": 0.58, "BE": 0.58, "MA": 0.57, "SI": 0.55,
+    "OM": 0.55, "UR": 0.54,
+}
+
+_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_KEEP = str.maketrans({**{i: None for i in range(128)}, **{ord(c): c for c in _LETTERS},
+                       **{ord(c.lower()): c for c in _LETTERS}})
+
+
+class NgramModel:
+    """Letter-bigram model scoring text by its mean log10 bigram probability.
+
+    ``confidence`` rescales that score so that uniformly random letters give
+    0 and text with English bigram statistics gives about 1.
+    """
+
+    def __init__(self, probabilities: dict[str, float]) -> None:
+        """``probabilities`` maps letter pairs to relative frequencies; pairs left out share the remaining mass."""
+        known = {pair: p for pair, p in probabilities.items() if p > 0}
+        rest = max(1 - sum(known.values()), 0.0)
+        missing = 676 - len(known)
+        floor = rest / missing if missing and rest > 0 else min(known.values()) / 10
+        self.logp = {a + b: math.log10(known.get(a + b, floor)) for a in _LETTERS for b in _LETTERS}
+        self.english_score = sum(p * self.logp[pair] for pair, p in known.items()) + rest * math.log10(floor)
+        self.random_score = sum(self.logp.values()) / 676
+
+    @classmethod
+    def from_text(cls, corpus: str) -> "NgramModel":
+        letters = corpus.translate(_KEEP)
+        counts: dict[str, int] = {}
+        for pair in map(add, letters[:-1], letters[1:]):
+            counts[pair] = counts.get(pair, 0) + 1
+        total = sum(counts.values())
+        return cls({pair: count / total for pair, count in counts.items()})
+
+    def score(self, text: str) -> float:
+        letters = text.translate(_KEEP)
+        if len(letters) < 2:
+            return self.random_score
+        return sum(map(self.logp.__getitem__, map(add, letters[:-1], letters[1:]))) / (len(letters) - 1)
+
+    def confidence(self, text: str) -> float:
+        value = (self.score(text) - self.random_score) / (self.english_score - self.random_score)
+        return min(max(value, 0.0), 1.0)
+
+
+ENGLISH = NgramModel({pair: percent / 100 for pair, percent in COMMON_BIGRAMS.items()})
+
+
+@dataclass
+class RailCandidate:
+    rails: int
+    confidence: float
+    plaintext: str
+
+
+_worker_groups: dict[int, list[str]] = {}
+_worker_model: NgramModel = ENGLISH
+
+
+def _init_worker(groups: dict[int, list[str]], model: NgramModel) -> None:
+    global _worker_groups, _worker_model
+    _worker_groups, _worker_model = groups, model
+
+
+def _try_rails(length: int, rails: int) -> tuple[int, int, list[tuple[float, str]]]:
+    inverse = inverse_order(length, rails)
+    results = []
+    for cipher in _worker_groups[length]:
+        plain = "".join(map(cipher.__getitem__, inverse))
+        results.append((_worker_model.confidence(plain), plain))
+    return length, rails, results
+
+
+@overload
+def crack_rail_fence(ciphertexts: str, max_rails: int | None = None, threshold: float = 0.8,
+                     workers: int | None = None, model: NgramModel = ENGLISH) -> list[RailCandidate]: ...
+
+
+@overload
+def crack_rail_fence(ciphertexts: Sequence[str], max_rails: int | None = None, threshold: float = 0.8,
+                     workers: int | None = None, model: NgramModel = ENGLISH) -> list[list[RailCandidate]]: ...
+
+
+def crack_rail_fence(ciphertexts: str | Sequence[str], max_rails: int | None = None, threshold: float = 0.8,
+                     workers: int | None = None, model: NgramModel = ENGLISH
+                     ) -> list[RailCandidate] | list[list[RailCandidate]]:
+    """Rank rail counts ``2..max_rails`` for every ciphertext, best first.
+
+    ``max_rails`` defaults to ``min(length - 1, DEFAULT_MAX_RAILS)``.
+    Returns one candidate list per ciphertext (a single list if a single
+    string was given).  Rail counts that were never tried because of early
+    stopping are simply missing from the lists.  ``workers=1`` runs in the
+    current process.
+    """
+    single = isinstance(ciphertexts, str)
+    texts = [ciphertexts] if single else list(ciphertexts)
+    groups: dict[int, list[str]] = {}
+    for text in texts:
+        groups.setdefault(len(text), []).append(text)
+    found: dict[int, list[list[RailCandidate]]] = {n: [[] for _ in group] for n, group in groups.items()}
+
+    def collect(length: int, rails: int, results: list[tuple[float, str]]) -> bool:
+        for candidates, (confidence, plain) in zip(found[length], results):
+            candidates.append(RailCandidate(rails, confidence, plain))
+        return all(max(c.confidence for c in candidates) >= threshold for candidates in found[length])
+
+    def rail_counts(length: int) -> range:
+        return range(2, (min(length - 1, DEFAULT_MAX_RAILS) if max_rails is None else max_rails) + 1)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(groups, model)
+        try:
+            for length in groups:
+                for rails in rail_counts(length):
+                    if collect(*_try_rails(length, rails)):
+                        break
+        finally:
+            _init_worker({}, ENGLISH)
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(groups, model)) as pool:
+            for length in groups:
+                todo = iter(rail_counts(length))
+                pending = set()
+                # Results are taken in rail order so the early stop picks the same keys as the serial path.
+                finished: dict[int, list[tuple[float, str]]] = {}
+                next_rails = 2
+                stop = False
+                while not stop:
+                    for rails in islice(todo, 2 * workers - len(pending)):
+                        pending.add(pool.submit(_try_rails, length, rails))
+                    if not pending:
+                        break
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _, rails, results = future.result()
+                        finished[rails] = results
+                    while next_rails in finished and not stop:
+                        stop = collect(length, next_rails, finished.pop(next_rails))
+                        next_rails += 1
+                for future in pending:
+                    future.cancel()
+
+    position = dict.fromkeys(groups, 0)
+    ranked = []
+    for text in texts:
+        candidates = found[len(text)][position[len(text)]]
+        position[len(text)] += 1
+        ranked.append(sorted(candidates, key=lambda c: (-c.confidence, c.rails)))
+    return ranked[0] if single else ranked
@@ -0,0 +1,71 @@
+"""Selective (word-level) Caesar encryption for large document sets.
+
+The watchlist is compiled once into a single trie-shaped regular expression,
+so finding the words to encrypt is one ``re.sub`` pass per document instead
+of a list lookup per word.  Words are matched as whole whitespace-delimited
+tokens, exactly like ``text.split()`` in the lab's ``selective_encrypt``, but
+the original spacing and line breaks are kept.
+
+There is deliberately no ``decrypt``: an encrypted word is indistinguishable
+from a plain token that happens to equal it (with watchlist ``ab`` and key 2,
+a plain ``cd`` looks exactly like an encrypted ``ab``), so the ciphertext
+alone does not say which tokens to shift back.
+"""
+
+import re
+from typing import Iterable, Iterator
+
+from .caesar import text_table
+
+
+def _trie_regex(node: dict) -> str:
+    branches = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    if "" in node:
+        return "(?:" + "|".join(branches) + ")?"
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+def word_pattern(words: Iterable[str]) -> re.Pattern:
+    """Compile words into one regex that matches them only as whole tokens."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    if not trie:
+        return re.compile(r"(?!)")
+    return re.compile(r"(?<!\S)" + _trie_regex(trie) + r"(?!\S)")
+
+
+class SelectiveCipher:
+    def __init__(self, words: Iterable[str], key: int) -> None:
+        # Words containing whitespace can never equal a single token.
+        self.words = frozenset(w for w in words if w and w.split() == [w])
+        self.key = key
+        self._pattern = word_pattern(self.words)
+        self._encrypt_table = text_table(key)
+
+    def _encrypt_word(self, match: re.Match) -> str:
+        return match.group().translate(self._encrypt_table)
+
+    def encrypt(self, text: str) -> str:
+        return self._pattern.sub(self._encrypt_word, text)
+
+    def encrypt_many(self, documents: Iterable[str]) -> Iterator[str]:
+        sub, repl = self._pattern.sub, self._encrypt_word
+        for document in documents:
+            yield sub(repl, document)
+
+
+def selective_encrypt(text: str, key: int, words_to_encrypt: Iterable[str]) -> str:
+    return SelectiveCipher(words_to_encrypt, key).encrypt(text)
+
+
+def encrypt_corpus(documents: Iterable[str], key: int, words_to_encrypt: Iterable[str]) -> Iterator[str]:
+    """Lazily encrypt every document of a corpus with one compiled watchlist."""
+    return SelectiveCipher(words_to_encrypt, key).encrypt_many(documents)
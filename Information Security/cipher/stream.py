@@ -0,0 +1,54 @@
+"""Chunked Caesar encryption of files and pipes in constant memory.
+
+Data is read with ``readinto`` into one reusable buffer and each block is
+shifted with the byte tables from :mod:`cipher.caesar`.  Caesar only touches
+ASCII letters, so working on raw bytes gives the same result as
+``encrypt_text``/``decrypt_text`` on the decoded text for UTF-8 (or any
+ASCII-compatible) input, and a multi-byte character split across two blocks
+is never damaged.
+"""
+
+import time
+from typing import BinaryIO, NamedTuple
+
+from .caesar import byte_table
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+# A NamedTuple rather than a dataclass: importing dataclasses pulls in inspect on every CLI run.
+class StreamStats(NamedTuple):
+    bytes: int
+    seconds: float
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes / self.seconds / 1e6 if self.seconds else float("inf")
+
+    def __str__(self) -> str:
+        return f"{self.bytes:,} bytes in {self.seconds:.3f} s ({self.mb_per_s:,.2f} MB/s)"
+
+
+def translate_stream(src: BinaryIO, dst: BinaryIO, table: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE) -> StreamStats:
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    total = 0
+    start = time.perf_counter()
+    while True:
+        n = src.readinto(buf)
+        if not n:
+            break
+        dst.write(buf.translate(table) if n == chunk_size else view[:n].tobytes().translate(table))
+        total += n
+    dst.flush()
+    return StreamStats(total, time.perf_counter() - start)
+
+
+def encrypt_stream(src: BinaryIO, dst: BinaryIO, key: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> StreamStats:
+    return translate_stream(src, dst, byte_table(key), chunk_size)
+
+
+def decrypt_stream(src: BinaryIO, dst: BinaryIO, key: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> StreamStats:
+    return translate_stream(src, dst, byte_table(-key), chunk_size)
@@ -0,0 +1,181 @@
+"""Benchmark suite for the cipher package with throughput regression tracking.
+
+Every case runs the public encrypt function over a sweep of input sizes and
+key parameters (Caesar shift, watchlist size, Playfair key length, rail
+count, columnar key length) and records ops/s, MB/s and the peak memory of
+one cold call traced with :mod:`tracemalloc`.  Each timing sample loops
+the call until it lasts at least ``--min-time`` seconds (like ``timeit``)
+and the best of ``--repeat`` samples is kept, so small inputs are not
+dominated by timer noise.  Sizes are in characters.  Run from the
+"Information Security" directory::
+
+    python -m cipher.suite --save baseline.json
+    python -m cipher.suite --sizes 1K,1M,100M --compare baseline.json
+
+With ``--compare`` the run exits with status 1 if any case that is also in
+the baseline lost more than ``--tolerance`` (default 10%) of its MB/s;
+compare only against baselines recorded on the same machine.
+"""
+
+import argparse
+import json
+import platform
+import random
+import string
+import sys
+import time
+import timeit
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterator
+
+from . import caesar, columnar, playfair, railfence, selective
+from .bench import sample_text
+from .cli import parse_size
+
+DEFAULT_SIZES = "1K,64K,1M"
+KEY_LETTERS = string.ascii_uppercase
+
+
+@dataclass
+class Result:
+    name: str
+    params: str
+    size: int
+    seconds: float
+    ops_per_s: float
+    mb_per_s: float
+    peak_bytes: int
+
+    @property
+    def case(self) -> str:
+        return f"{self.name}[{self.params}]@{self.size}"
+
+    def __str__(self) -> str:
+        return (f"{self.name:<36} {self.params:<12} {self.size:>12,} B {self.ops_per_s:12,.1f} ops/s "
+                f"{self.mb_per_s:10.2f} MB/s {self.peak_bytes / 1e6:10.2f} MB peak")
+
+
+def random_key(length: int, seed: int = 0) -> str:
+    return "".join(random.Random(seed).choices(KEY_LETTERS, k=length))
+
+
+def watchlist_text(size: int, words: int, seed: int = 0) -> tuple[str, list[str]]:
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(words * 5)]
+    text = " ".join(rng.choices(vocabulary, k=max(size // 7, 1)))
+    return text[:size], rng.sample(vocabulary, words)
+
+
+def cases(size: int) -> Iterator[tuple[str, str, Callable[[], Any], Callable[[], None]]]:
+    """Yield ``(name, params, call, reset)``; ``reset`` drops caches so a call starts cold."""
+    text = sample_text(size)
+
+    def nothing() -> None:
+        pass
+
+    for key in (3, 13):
+        yield "caesar.encrypt_text", f"key={key}", lambda key=key: caesar.encrypt_text(text, key), nothing
+    for words in (10, 1000):
+        document, watched = watchlist_text(size, words)
+        yield ("selective.selective_encrypt", f"words={words}",
+               lambda document=document, watched=watched: selective.selective_encrypt(document, 3, watched), nothing)
+    for length in (5, 25):
+        key = random_key(length)
+        yield ("playfair.playfair_encrypt", f"key_len={length}",
+               lambda key=key: playfair.playfair_encrypt(text, key), playfair.key_cache.clear)
+    for rails in (2, 5, 20):
+        yield ("railfence.encrypt_rail_fence", f"rails={rails}",
+               lambda rails=rails: railfence.encrypt_rail_fence(text, rails), railfence.clear_cache)
+    unicode_text = "".join(random.Random(1).choices(string.ascii_letters + "  çé€😀", k=size))
+    yield ("railfence.encrypt_rail_fence_unicode", "rails=5",
+           lambda: railfence.encrypt_rail_fence_unicode(unicode_text, 5), railfence.clear_cache)
+    for length in (4, 16, 64):
+        key = random_key(length)
+        yield "columnar.encrypt_columnar", f"key_len={length}", lambda key=key: columnar.encrypt_columnar(text, key), nothing
+
+
+def peak_memory(call: Callable[[], Any], reset: Callable[[], None]) -> int:
+    reset()
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def best_time(call: Callable[[], Any], repeat: int, min_time: float) -> float:
+    timer = timeit.Timer(call)
+    number = 1
+    while (elapsed := timer.timeit(number)) < min_time:
+        number = max(number * 2, int(number * min_time / elapsed * 1.2) if elapsed else number * 10)
+    return min([elapsed] + timer.repeat(repeat - 1, number)) / number
+
+
+def run(sizes: list[int], repeat: int = 3, only: str | None = None, min_time: float = 0.2) -> list[Result]:
+    results = []
+    for size in sizes:
+        for name, params, call, reset in cases(size):
+            if only and only not in name:
+                continue
+            peak = peak_memory(call, reset)
+            seconds = max(best_time(call, repeat, min_time), 1e-9)
+            result = Result(name, params, size, seconds, 1 / seconds, size / seconds / 1e6, peak)
+            print(result, flush=True)
+            results.append(result)
+    return results
+
+
+def save(path: str, results: list[Result]) -> None:
+    document = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(document, file, indent=2)
+
+
+def compare(path: str, results: list[Result], tolerance: float = 0.10) -> list[str]:
+    """Describe every case whose MB/s dropped by more than ``tolerance`` against the saved run."""
+    with open(path, "r", encoding="utf-8") as file:
+        baseline = {Result(**entry).case: Result(**entry) for entry in json.load(file)["results"]}
+    regressions = []
+    for result in results:
+        before = baseline.get(result.case)
+        if before is None:
+            continue
+        change = result.mb_per_s / before.mb_per_s - 1
+        if change < -tolerance:
+            regressions.append(f"{result.case}: {before.mb_per_s:.2f} -> {result.mb_per_s:.2f} MB/s ({change:+.1%})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated input sizes (default {DEFAULT_SIZES}, up to e.g. 100M)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the best is kept")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per timing sample")
+    parser.add_argument("--only", help="run only cases whose function name contains this text")
+    parser.add_argument("--save", metavar="JSON", help="write the results to this file")
+    parser.add_argument("--compare", metavar="JSON", help="fail if slower than this saved run")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed MB/s loss for --compare (default 0.10)")
+    args = parser.parse_args(argv)
+
+    results = run([parse_size(size) for size in args.sizes.split(",")], args.repeat, args.only, args.min_time)
+    if args.save:
+        save(args.save, results)
+    if args.compare:
+        regressions = compare(args.compare, results, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())